@@ -1,22 +1,23 @@
 # bybit/rest.py
-import aiohttp
 import asyncio
 
+from utils.http_client import get_session
+
 BASE_URL = "https://api.bybit.com"
 
 async def fetch_json(session, url, params):
-    async with session.get(url, params=params, timeout=10) as resp:
+    # Uses the session's per-socket timeouts, so waiting for a pooled connection does not count
+    async with session.get(url, params=params) as resp:
         return await resp.json()
 
 async def get_futures_symbols():
-    async with aiohttp.ClientSession() as session:
-        url = f"{BASE_URL}/v5/market/instruments-info"
-        data = await fetch_json(session, url, {"category": "linear"})
-        return [
-            s["symbol"]
-            for s in data["result"]["list"]
-            if s["quoteCoin"] == "USDT" and s["status"] == "Trading"
-        ]
+    url = f"{BASE_URL}/v5/market/instruments-info"
+    data = await fetch_json(get_session(), url, {"category": "linear"})
+    return [
+        s["symbol"]
+        for s in data["result"]["list"]
+        if s["quoteCoin"] == "USDT" and s["status"] == "Trading"
+    ]
 
 async def get_session_candles(session, symbol, interval, start_ts):
     url = f"{BASE_URL}/v5/market/kline"
@@ -1,8 +1,9 @@
 import asyncio
-import aiohttp
 from datetime import datetime, timedelta, timezone
 import logging
 
+import numpy as np
+
 from bybit.rest import get_futures_symbols, get_session_candles
 from bybit.websocket import start_ws, prices
 
@@ -16,7 +17,6 @@ from indicators.stochastic import stochastic
 
 from engine.scanner_engine import scan
 from output.table import render_table
-from notifier.discord_bot import bot, send_table, start_bot
 
 from config import (
     MAX_SYMBOLS,
@@ -24,6 +24,7 @@ from config import (
     MIN_VOLUME_M
 )
 from utils.interval_parser import parse_intervals
+from utils.http_client import get_session, close_session
 
 # Set up custom logging with file details
 logger = logging.getLogger(__name__)
@@ -104,78 +105,79 @@ async def get_scanner_data_raw():
         start_ts = current_session_start
         logger.info(f"📊 Session: {session_name}, Weight: {weight}, Using current session data (hours elapsed: {hours_elapsed:.1f})")
 
-    # Create a new session for this request
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            get_session_candles(session, s, "5", start_ts)
-            for s in symbols
-        ]
-        candle_sets = await asyncio.gather(*tasks)
-
-        market = []
-        filtered_by_candles = 0
-        filtered_by_volume = 0
-
-        for s, candles in zip(symbols, candle_sets):
-            if not candles or len(candles) < 20:  # Minimum 20 candles (2 hours of 5-min data)
-                filtered_by_candles += 1
-                continue
-
-            closes = [c["close"] for c in candles]
-            highs  = [c["high"] for c in candles]
-            lows   = [c["low"] for c in candles]
-
-            price = prices.get(s, closes[-1])
-            vwap = calculate_vwap(candles)
-
-            if not price or not vwap:
-                continue
-
-            # ============================
-            # 🔥 FIX 1 — VOLUME BYBIT BENAR
-            # ============================
-            volumes = [
-                c.get("volume", 0) * c.get("close", 0)
-                for c in candles
-            ]
-            total_volume = sum(volumes)
-
-            if total_volume <= 0:
-                continue
-
-            volume_m = total_volume / 1_000_000
-
-            # ============================
-            # 🔥 FIX 2 — FILTER AMAN
-            # ============================
-            if volume_m < MIN_VOLUME_M:
-                filtered_by_volume += 1
-                continue
-
-            market.append({
-                "symbol": s,
-                "price": price,
-                "vwap": vwap,
-                "volume_m": round(volume_m, 2),
-                "trend": "ABOVE VWAP" if price > vwap else "BELOW VWAP",
-                "vwap_dev": round((price - vwap) / vwap * 100, 2),
-
-                "rsi": rsi(closes),
-                "macd": macd_hist(closes),
-                "atr": atr(highs, lows, closes),
-                "stoch": stochastic(highs, lows, closes),
-            })
-
-        logger.info(f"📊 Filtered by candles: {filtered_by_candles}, by volume: {filtered_by_volume}")
-        logger.info(f"📊 Final market data: {len(market)} symbols")
+    # Reuse the shared HTTP session (kept-alive connections, cached DNS)
+    session = get_session()
+    tasks = [
+        get_session_candles(session, s, "5", start_ts)
+        for s in symbols
+    ]
+    candle_sets = await asyncio.gather(*tasks)
+
+    market = []
+    filtered_by_candles = 0
+    filtered_by_volume = 0
+
+    for s, candles in zip(symbols, candle_sets):
+        if not candles or len(candles) < 20:  # Minimum 20 candles (2 hours of 5-min data)
+            filtered_by_candles += 1
+            continue
+
+        # Candle dicts -> column arrays once; VWAP and volume are vector reductions
+        high_a, low_a, close_a, volume_a = np.array(
+            [(c["high"], c["low"], c["close"], c["volume"]) for c in candles],
+            dtype=float
+        ).T
+        closes = close_a.tolist()
+        highs  = high_a.tolist()
+        lows   = low_a.tolist()
+
+        price = prices.get(s, closes[-1])
+        vwap = calculate_vwap(high_a, low_a, close_a, volume_a)
+
+        if not price or not vwap:
+            continue
 
         # ============================
-        # SCAN & RANK
+        # 🔥 FIX 1 — VOLUME BYBIT BENAR
         # ============================
-        ranked = scan(market, session_name, weight)
+        total_volume = float(np.dot(volume_a, close_a))
+
+        if total_volume <= 0:
+            continue
 
-        # Return table text for Discord
-        return render_table(ranked[:15], session_name, weight)
+        volume_m = total_volume / 1_000_000
+
+        # ============================
+        # 🔥 FIX 2 — FILTER AMAN
+        # ============================
+        if volume_m < MIN_VOLUME_M:
+            filtered_by_volume += 1
+            continue
+
+        market.append({
+            "symbol": s,
+            "price": price,
+            "vwap": vwap,
+            "volume_m": round(volume_m, 2),
+            "trend": "ABOVE VWAP" if price > vwap else "BELOW VWAP",
+            "vwap_dev": round((price - vwap) / vwap * 100, 2),
+
+            "rsi": rsi(closes),
+            "macd": macd_hist(closes),
+            "atr": atr(highs, lows, closes),
+            "stoch": stochastic(highs, lows, closes),
+        })
+
+    logger.info(f"📊 Filtered by candles: {filtered_by_candles}, by volume: {filtered_by_volume}")
+    logger.info(f"📊 Final market data: {len(market)} symbols")
+
+    # ============================
+    # SCAN & RANK
+    # ============================
+    ranked = scan(market, session_name, weight)
+
+    # Return table text for Discord
+    return render_table(ranked[:15], session_name, weight)
 
 async def get_scanner_data():
     """Callback function for Discord bot to get updated scanner data"""
@@ -213,6 +215,10 @@ async def get_scanner_data():
 
 async def main():
     """Main function - now sets up the bot first, then websocket"""
+    # Imported here rather than at module level: the spawned render worker re-imports
+    # this module and must not build a second bot, database connection and caches
+    from notifier.discord_bot import bot, start_bot
+
     # Set up bot callback FIRST
     bot.set_update_callback(get_scanner_data)
 
@@ -236,7 +242,10 @@ async def main():
     logger.info("✅ WebSocket connection started")
 
     # Wait for bot task (this will run forever)
-    await bot_task
+    try:
+        await bot_task
+    finally:
+        await close_session()
 
 async def cache_updater():
     """Background task to keep scanner cache fresh"""
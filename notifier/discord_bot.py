@@ -3,13 +3,21 @@
 import discord
 from discord.ext import commands, tasks
 import asyncio
+import atexit
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 import sqlite3
 import os
+import re
+import threading
+import time
+import traceback
 import logging
+from functools import lru_cache
+from io import BytesIO
 from config import DISCORD_BOT_TOKEN, REFRESH_INTERVAL, TABLE_FOOTER_TEXT, EMBED_FOOTER_TEXT
 from typing import Optional
-from table_generator import generate_table_image
+from render_worker import get_render_executor, render_table_image, close_render_executor
 from utils.interval_parser import parse_intervals, format_interval
 from sessions.session_manager import detect_session
 
@@ -28,29 +36,39 @@ handler.setFormatter(formatter)
 # Add handler to logger
 logger.addHandler(handler)
 
+# Western Indonesia Time (UTC+7), used for every displayed timestamp
+WIB = timezone(timedelta(hours=7))
+
+# Flag emoji per trading session, keyed by upper-cased session name
+SESSION_FLAGS = {
+    'SYDNEY': '🇦🇺',
+    'TOKYO': '🇯🇵',
+    'LONDON': '🇬🇧',
+    'NEW YORK': '🇺🇸',  # Space, not underscore
+    'NEW_YORK': '🇺🇸',  # Underscore for backward compatibility
+    'ASIAN': '🌏',
+    'EUROPE': '🇪🇺',
+    'ASIA': '🌏'
+}
+
 def get_session_flag(session_name: str) -> str:
     """Get flag emoji for trading session"""
-    flags = {
-        'SYDNEY': '🇦🇺',
-        'TOKYO': '🇯🇵',
-        'LONDON': '🇬🇧',
-        'NEW YORK': '🇺🇸',  # Space, not underscore
-        'NEW_YORK': '🇺🇸',  # Underscore for backward compatibility
-        'ASIAN': '🌏',
-        'EUROPE': '🇪🇺',
-        'ASIA': '🌏'
-    }
-    return flags.get(session_name.upper(), '')
+    return SESSION_FLAGS.get(session_name.upper(), '')
 
 def get_next_session_info() -> tuple[str, str]:
     """Get the next trading session name and start time"""
+    # Sessions change on UTC hour boundaries, so the answer is computed once per hour
     now = datetime.now(timezone.utc)
-    
+    return _next_session_info_for_hour(now.replace(minute=0, second=0, microsecond=0))
+
+@lru_cache(maxsize=32)
+def _next_session_info_for_hour(now: datetime) -> tuple[str, str]:
+    """Compute next session info for an hour bucket (now truncated to the UTC hour)"""
     # Session order: Sydney -> Tokyo -> London -> New York -> Sydney (next day)
     sessions_order = ["Sydney", "Tokyo", "London", "New York"]
     
-    # Find current session index
-    current_session, _ = detect_session()
+    # Find current session index (for this hour bucket, not the wall clock, so the cached answer is consistent)
+    current_session, _ = detect_session(now)
     try:
         current_index = sessions_order.index(current_session)
         next_index = (current_index + 1) % len(sessions_order)
@@ -83,52 +101,96 @@ def get_next_session_info() -> tuple[str, str]:
             next_time += timedelta(days=1)
     
     # Format time as WIB (UTC+7)
-    next_time_wib = next_time + timedelta(hours=7)
+    next_time_wib = next_time.astimezone(WIB)
     time_str = next_time_wib.strftime('%H:%M:%S WIB')
     
     return next_session, time_str
 
+@lru_cache(maxsize=64)
+def _starting_embed_dict(interval_str: str) -> dict:
+    """Serialized 'starting' embed for an interval, built once per interval string"""
+    return discord.Embed(
+        title=f"VWAP Scanner [{interval_str}]",
+        description=f"Starting VWAP scanner with {interval_str} refresh interval...\nLoading data...",
+        color=discord.Color.blue()
+    ).to_dict()
+
+@lru_cache(maxsize=64)
+def _stopped_embed_dict(interval_str: str) -> dict:
+    """Serialized 'stopped' embed for an interval, built once per interval string"""
+    return discord.Embed(
+        title=f"VWAP Scanner [{interval_str}]",
+        description="VWAP scanner stopped",
+        color=discord.Color.red()
+    ).to_dict()
+
+def _starting_embed(interval_str: str) -> discord.Embed:
+    """Fresh 'starting' embed from the cached template (safe to mutate)"""
+    return discord.Embed.from_dict(_starting_embed_dict(interval_str))
+
+def _stopped_embed(interval_str: str) -> discord.Embed:
+    """Fresh 'stopped' embed from the cached template (safe to mutate)"""
+    return discord.Embed.from_dict(_stopped_embed_dict(interval_str))
+
+@lru_cache(maxsize=64)
+def _scanner_embed_dict(interval_str: str, session_name: str) -> dict:
+    """Serialized scanner embed for an interval and session, with {placeholders} for per-tick values"""
+    embed = discord.Embed(
+        title=f"BYBIT FUTURES VWAP SCANNER - UPDATED EVERY {interval_str.upper()}",
+        description=f"**Current Session:** {session_name} {get_session_flag(session_name)}\n**Weight:** {{weight}}\n**Last Updated:** {{last_updated}}\n**Next Update:** {{next_update}}\n**Next Session:** {{next_session}}",
+        color=discord.Color.blue()
+    )
+
+    # Add footer if configured
+    if EMBED_FOOTER_TEXT:
+        embed.set_footer(text=EMBED_FOOTER_TEXT)
+
+    return embed.to_dict()
+
+def _scanner_embed(interval_str: str, session_name: str, filename: str, **values) -> discord.Embed:
+    """Scanner embed from the cached template with per-tick values and the image attachment filled in"""
+    data = dict(_scanner_embed_dict(interval_str, session_name))
+    data['description'] = data['description'].format(**values)
+    data['image'] = {'url': f"attachment://{filename}"}
+    return discord.Embed.from_dict(data)
+
+# Header line of the scanner table, e.g. "Session : New York | Weight : 1.2" (session names may contain spaces)
+SESSION_LINE_RE = re.compile(r'^Session : ([^|\n]+) \| Weight : ([^|\n]+)', re.M)
+# The header sits in the first lines of the table, so the search never needs to look further
+SESSION_LINE_SEARCH_END = 512
+
+# Manual update triggers within this many seconds of the previous one are skipped
+TRIGGER_COOLDOWN = 2
+
+# Refresh intervals are fixed for the lifetime of the process, parse them once
+PARSED_INTERVALS = parse_intervals(REFRESH_INTERVAL)
+
 # Database setup
 DB_PATH = '/app/data/bot_states.db' if os.path.exists('/app') else 'bot_states.db'
-
-def init_database():
-    """Initialize the database and create tables if they don't exist"""
-    # Ensure directory exists (only needed for Docker path)
-    db_dir = os.path.dirname(DB_PATH)
-    if db_dir:
-        os.makedirs(db_dir, exist_ok=True)
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # Create channel_states table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS channel_states (
-            channel_id INTEGER NOT NULL,
-            interval INTEGER NOT NULL,
-            message_id INTEGER NOT NULL,
-            guild_id INTEGER,
-            running BOOLEAN NOT NULL DEFAULT 0,
-            server_name TEXT,
-            channel_name TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            PRIMARY KEY (channel_id, interval)
-        )
-    ''')
-
-    # Create previous_rankings table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS previous_rankings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_name TEXT NOT NULL,
-            symbol TEXT NOT NULL,
-            rank INTEGER NOT NULL,
-            scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(session_name, symbol, scan_time)
-        )
-    ''')
-
+# Ensure directory exists once at import (only needed for Docker path)
+os.makedirs(os.path.dirname(DB_PATH) or '.', exist_ok=True)
+# Bump when migrate_schema gains a step that existing databases must run
+SCHEMA_VERSION = 3
+
+# One connection is shared by every helper; they run in worker threads, so db_lock serializes access
+_connection = None
+db_lock = threading.Lock()
+
+def get_connection():
+    """Get the shared database connection, opening it on first use"""
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _connection.row_factory = sqlite3.Row  # Rows are addressable by column name (and still unpack like tuples)
+        _connection.execute('PRAGMA journal_mode=WAL')
+        _connection.execute('PRAGMA synchronous=NORMAL')
+        _connection.execute('PRAGMA temp_store=MEMORY')
+        _connection.execute('PRAGMA cache_size=-20000')
+        atexit.register(_connection.close)
+    return _connection
+
+def migrate_schema(cursor):
+    """Bring tables created by older versions up to the current schema"""
     # Migrate old table structure if it exists
     try:
         # Check if old table structure exists (without id column)
@@ -179,6 +241,10 @@ def init_database():
     except Exception as e:
         logger.warning(f"⚠️ Table migration check failed (probably normal): {e}")
 
+    # previous_rankings belongs to rank_db, which indexes the columns it queries;
+    # this (session_name, rank) index only slowed down its inserts
+    cursor.execute('DROP INDEX IF EXISTS idx_prev_rank_session')
+
     # Add guild_id column if it doesn't exist (migration)
     try:
         cursor.execute("ALTER TABLE channel_states ADD COLUMN guild_id INTEGER")
@@ -187,48 +253,100 @@ def init_database():
         # Column already exists
         pass
 
-    conn.commit()
-    conn.close()
+def init_database():
+    """Initialize the database and create tables if they don't exist"""
+    with db_lock:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        # Create channel_states table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS channel_states (
+                channel_id INTEGER NOT NULL,
+                interval INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                guild_id INTEGER,
+                running BOOLEAN NOT NULL DEFAULT 0,
+                server_name TEXT,
+                channel_name TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (channel_id, interval)
+            )
+        ''')
+
+        # Create previous_rankings table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS previous_rankings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_name TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(session_name, symbol, scan_time)
+            )
+        ''')
+
+        # Migrations only need to run once per database; schema_meta records that they have
+        cursor.execute('CREATE TABLE IF NOT EXISTS schema_meta (version INTEGER PRIMARY KEY)')
+        cursor.execute('SELECT MAX(version) FROM schema_meta')
+        if (cursor.fetchone()[0] or 0) < SCHEMA_VERSION:
+            migrate_schema(cursor)
+            cursor.execute('INSERT OR REPLACE INTO schema_meta (version) VALUES (?)', (SCHEMA_VERSION,))
+
+        conn.commit()
     logger.info("✅ Database initialized")
 
 def save_channel_state(channel_id, interval, message_id, running, server_name=None, channel_name=None, guild_id=None):
     """Save or update channel state in database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with db_lock:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT OR REPLACE INTO channel_states
+            (channel_id, interval, message_id, guild_id, running, server_name, channel_name, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (channel_id, interval, message_id, guild_id, running, server_name, channel_name))
 
-    cursor.execute('''
-        INSERT OR REPLACE INTO channel_states
-        (channel_id, interval, message_id, guild_id, running, server_name, channel_name, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-    ''', (channel_id, interval, message_id, guild_id, running, server_name, channel_name))
+        conn.commit()
 
-    conn.commit()
-    conn.close()
+def save_channel_states_bulk(rows):
+    """Save or update several channel states in a single transaction
+
+    Args:
+        rows: List of (channel_id, interval, message_id, running, server_name, channel_name, guild_id) tuples
+    """
+    with db_lock:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        cursor.executemany('''
+            INSERT OR REPLACE INTO channel_states
+            (channel_id, interval, message_id, running, server_name, channel_name, guild_id, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', rows)
+
+        conn.commit()
 
 def load_channel_states():
     """Load all channel states from database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with db_lock:
+        conn = get_connection()
+        cursor = conn.cursor()
 
-    cursor.execute('SELECT channel_id, interval, message_id, guild_id, running, server_name, channel_name FROM channel_states WHERE running = 1')
-    rows = cursor.fetchall()
-
-    conn.close()
+        cursor.execute('SELECT channel_id, interval, message_id, guild_id, running, server_name, channel_name FROM channel_states WHERE running = 1')
+        rows = cursor.fetchall()
 
     states = {}
     for row in rows:
-        channel_id, interval, message_id, guild_id, running, server_name, channel_name = row
-        
         # Create nested structure: states[channel_id][interval]
-        if channel_id not in states:
-            states[channel_id] = {}
-        
-        states[channel_id][interval] = {
-            'message_id': message_id,
-            'guild_id': guild_id,
-            'running': bool(running),
-            'server_name': server_name,
-            'channel_name': channel_name
+        states.setdefault(row['channel_id'], {})[row['interval']] = {
+            'message_id': row['message_id'],
+            'guild_id': row['guild_id'],
+            'running': bool(row['running']),
+            'server_name': row['server_name'],
+            'channel_name': row['channel_name']
         }
 
     return states
@@ -240,60 +358,46 @@ def remove_channel_state(channel_id, interval=None):
         channel_id: Discord channel ID
         interval: Specific interval to remove, or None to remove all intervals
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with db_lock:
+        conn = get_connection()
+        cursor = conn.cursor()
 
-    if interval is None:
-        # Remove all intervals for this channel
-        cursor.execute('DELETE FROM channel_states WHERE channel_id = ?', (channel_id,))
-    else:
-        # Remove specific interval
-        cursor.execute('DELETE FROM channel_states WHERE channel_id = ? AND interval = ?', (channel_id, interval))
+        if interval is None:
+            # Remove all intervals for this channel
+            cursor.execute('DELETE FROM channel_states WHERE channel_id = ?', (channel_id,))
+        else:
+            # Remove specific interval
+            cursor.execute('DELETE FROM channel_states WHERE channel_id = ? AND interval = ?', (channel_id, interval))
 
-    conn.commit()
-    conn.close()
-
-def save_previous_rankings(session_name: str, rankings: list):
-    """Save current rankings for a session to database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # Delete existing rankings for this session
-    cursor.execute('DELETE FROM previous_rankings WHERE session_name = ?', (session_name,))
-
-    # Insert new rankings
-    for symbol, rank in rankings:
-        cursor.execute('''
-            INSERT INTO previous_rankings (session_name, symbol, rank, updated_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (session_name, symbol, rank))
-
-    conn.commit()
-    conn.close()
-
-def load_previous_rankings(session_name: str) -> list:
-    """Load previous rankings for a session from database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute('SELECT symbol, rank FROM previous_rankings WHERE session_name = ? ORDER BY rank', (session_name,))
-    rows = cursor.fetchall()
-
-    conn.close()
-    return [(symbol, rank) for symbol, rank in rows]
+        conn.commit()
 
 class VWAPBot(commands.Bot):
     def __init__(self):
-        intents = discord.Intents.default()
-        intents.message_content = True
-        super().__init__(command_prefix="!", intents=intents)
+        # Only subscribe to the events the text commands need; presence, typing,
+        # voice and member events are never used and would only cost decode CPU
+        intents = discord.Intents(guilds=True, guild_messages=True, dm_messages=True, message_content=True)
+        super().__init__(
+            command_prefix="!",
+            intents=intents,
+            chunk_guilds_at_startup=False,  # Member lists are not needed
+            max_messages=None  # Scanner messages are tracked in channel_states, no message cache needed
+        )
 
         # Track per-channel, per-interval state
-        # Structure: channel_states[channel_id][interval] = {'message': Message, 'running': bool, 'task': Task}
-        self.channel_states = {}
+        # Structure: channel_states[channel_id][interval] = {'message': Message, 'running': bool, 'task': in-flight edit Task}
+        self.channel_states = defaultdict(dict)
+        # Number of interval states in channel_states, kept in sync wherever entries are added/removed
+        self.active_scanner_count = 0
         self.update_callback = None
         self.current_session = None
         self.session_check_task = None
+        self.last_trigger_time = 0.0  # time.monotonic() of the last trigger_all_updates
+        # Strong references to every running scheduler task, so none can be garbage-collected mid-run
+        self.background_tasks = set()
+        # Per-channel locks serializing !start/!stop so concurrent commands cannot race
+        self.channel_locks = {}
+        # One shared update loop per interval: interval_schedulers[interval] = {'task': Task, 'reset_timer_event': Event}
+        self.interval_schedulers = {}
 
     async def setup_hook(self):
         """Setup slash commands"""
@@ -301,7 +405,10 @@ class VWAPBot(commands.Bot):
         logger.info("✅ Bot setup complete (using traditional commands)")
 
         # Initialize database
-        init_database()
+        await asyncio.to_thread(init_database)
+
+        # Start the render worker now so the first scan doesn't pay for spawning it
+        get_render_executor().submit(os.getpid)
         
         # Start session change monitoring
         self.session_check_task = asyncio.create_task(self.monitor_session_changes())
@@ -309,7 +416,7 @@ class VWAPBot(commands.Bot):
 
     async def restore_channel_states(self):
         """Restore channel states from database and resume scanning"""
-        saved_states = load_channel_states()
+        saved_states = await asyncio.to_thread(load_channel_states)
 
         if not saved_states:
             logger.info("ℹ️ No previous channel states to restore")
@@ -339,7 +446,7 @@ class VWAPBot(commands.Bot):
                     if not channel:
                         logger.warning(f"⚠️ Could not find channel {channel_id} (guild: {state_data.get('guild_id')}), removing from database")
                         logger.warning(f"   Available guilds: {[g.name for g in self.guilds]}")
-                        remove_channel_state(channel_id, interval)
+                        await asyncio.to_thread(remove_channel_state, channel_id, interval)
                         continue
 
                     # Try to fetch the message
@@ -347,173 +454,204 @@ class VWAPBot(commands.Bot):
                         message = await channel.fetch_message(state_data['message_id'])
                     except discord.NotFound:
                         logger.warning(f"⚠️ Message {state_data['message_id']} not found in channel {channel_id}, skipping")
-                        remove_channel_state(channel_id, interval)
+                        await asyncio.to_thread(remove_channel_state, channel_id, interval)
                         continue
 
                     # Check if this channel+interval is already running
-                    if (channel_id in self.channel_states and 
-                        interval in self.channel_states[channel_id] and 
-                        self.channel_states[channel_id][interval]['running']):
+                    # (.get so the lookup does not create an empty channel entry in the defaultdict)
+                    existing_state = self.channel_states.get(channel_id, {}).get(interval)
+                    if existing_state and existing_state['running']:
                         logger.info(f"ℹ️ Channel {channel_id} interval {interval}s already running, skipping restoration")
                         continue
 
-                    # Initialize channel_states structure if needed
-                    if channel_id not in self.channel_states:
-                        self.channel_states[channel_id] = {}
-
                     # Restore the state
-                    self.channel_states[channel_id][interval] = {
+                    interval_state = {
                         'message': message,
                         'running': True,
                         'task': None,
-                        'last_scheduled_update': datetime.now(),  # Initialize with current time
-                        'reset_timer_event': asyncio.Event()  # Event to signal timer reset
+                        'interval_str': format_interval(interval)  # Precomputed display string
                     }
+                    self.channel_states[channel_id][interval] = interval_state
+                    self.active_scanner_count += 1
 
-                    # Resume the update loop
-                    task = asyncio.create_task(self.update_loop_for_channel(channel_id, interval))
-                    self.channel_states[channel_id][interval]['task'] = task
+                    # Resume updates through the interval's shared scheduler
+                    self.subscribe_interval(channel_id, interval, interval_state)
 
                     logger.info(f"✅ Restored scanner in {state_data.get('channel_name', f'channel {channel_id}')} [{interval}s] - resuming updates")
-                    logger.info(f"🔄 Update loop resumed for channel {channel_id} interval {interval}s - immediate update triggered")
+                    logger.info(f"🔄 Updates resumed for channel {channel_id} interval {interval}s - immediate update triggered")
                     
-                    # Give a small delay to ensure the update loop starts and performs immediate update
+                    # Give a small delay to ensure the scheduler starts and performs immediate update
                     await asyncio.sleep(0.1)
 
                 except Exception as e:
                     logger.error(f"❌ Failed to restore state for channel {channel_id} interval {interval}s: {e}")
-                    remove_channel_state(channel_id, interval)
+                    await asyncio.to_thread(remove_channel_state, channel_id, interval)
 
         logger.info("✅ Channel state restoration complete")
 
-    async def update_loop_for_channel(self, channel_id, interval):
-        """Update loop for a specific channel and interval"""
-        logger.info(f"🔄 Update loop started for channel {channel_id} interval {interval}s")
-        first_update = True
+    def subscribe_interval(self, channel_id, interval, interval_state):
+        """Make sure the shared scheduler for an interval is running, tracked in background_tasks"""
+        scheduler = self.interval_schedulers.get(interval)
+        if scheduler and not scheduler['task'].done():
+            # Show the new subscriber the interval's latest update right away. Resetting the shared
+            # timer would refetch and re-save rankings for every channel, wiping their rank changes.
+            # Before the first update finishes there is nothing to show; that update picks it up
+            if scheduler['last_update']:
+                interval_state['task'] = asyncio.create_task(
+                    self.update_channel_message(channel_id, interval, interval_state, *scheduler['last_update']),
+                    name=f"vwap-{channel_id}-{interval}"
+                )
+            return
+
+        task = asyncio.create_task(self.interval_scheduler(interval), name=f"vwap-{interval}")
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        self.interval_schedulers[interval] = {
+            'task': task,
+            'reset_timer_event': asyncio.Event(),  # Event to signal timer reset
+            'last_update': None  # (embed, image_bytes, filename) sent on the last tick
+        }
+
+    def interval_subscribers(self, interval):
+        """Get (channel_id, interval_state) pairs for every running scanner on an interval"""
+        return [
+            (channel_id, state)
+            for channel_id, intervals in self.channel_states.items()
+            if (state := intervals.get(interval)) and state['running']
+        ]
+
+    def remove_interval_state(self, channel_id, interval, interval_state):
+        """Drop a scanner from channel_states unless it was already stopped or replaced"""
+        intervals = self.channel_states.get(channel_id)
+        if not intervals or intervals.get(interval) is not interval_state:
+            return
+        interval_state['running'] = False
+        del intervals[interval]
+        self.active_scanner_count -= 1
+        # Clean up empty channel entry
+        if not intervals:
+            del self.channel_states[channel_id]
+
+    async def interval_scheduler(self, interval):
+        """Update loop shared by every channel running the given interval"""
+        logger.info(f"🔄 Scheduler started for interval {interval}s")
+        reset_event = self.interval_schedulers[interval]['reset_timer_event']
         loop_count = 0
-        
-        while (channel_id in self.channel_states and 
-               interval in self.channel_states[channel_id] and 
-               self.channel_states[channel_id][interval]['running']):
-            try:
+
+        try:
+            while self.interval_subscribers(interval):
                 loop_count += 1
-                logger.debug(f"🔁 Update loop iteration #{loop_count} for channel {channel_id} interval {interval}s")
-                
-                if first_update:
-                    logger.info(f"🚀 Performing immediate update for channel {channel_id} interval {interval}s (post-restart)")
-                    first_update = False
-                
-                logger.debug(f"📊 Getting scanner data for channel {channel_id} interval {interval}s...")
-                # Get updated data from callback
-                table_text = await self.update_callback()
-                logger.debug(f"✅ Got scanner data ({len(table_text) if table_text else 0} chars)")
-
-                if table_text and channel_id in self.channel_states and interval in self.channel_states[channel_id]:
-                    logger.debug(f"📤 Updating message in channel {channel_id} interval {interval}s")
-                    # Handle both old format (string) and new format (tuple)
-                    if isinstance(table_text, tuple):
-                        table_data, last_updated = table_text
-                    else:
-                        table_data = table_text
-                        # Container is set to WIB timezone, so datetime.now() gives WIB time
-                        wib_time = datetime.now()
-                        utc_time = datetime.utcnow()
-                        last_updated = f"{wib_time.strftime('%H:%M:%S')} WIB | {utc_time.strftime('%H:%M:%S')} UTC"
-
-                    # Parse session info from table_data
-                    session_name = "UNKNOWN"
-                    weight = "0.0"
-                    if isinstance(table_data, str):
-                        lines = table_data.split('\n')
-                        for line in lines:
-                            if line.startswith('Session :'):
-                                # Extract session and weight from "Session : Sydney | Weight : 0.6"
-                                parts = line.replace('Session : ', '').split(' | ')
-                                if len(parts) >= 2:
-                                    session_name = parts[0].strip()
-                                    weight_part = parts[1].replace('Weight : ', '').strip()
-                                    weight = weight_part
-                                break
-
-                    # Import interval formatter
-                    interval_str = format_interval(interval)
-
-                    # Update scheduled time and calculate next update
-                    self.channel_states[channel_id][interval]['last_scheduled_update'] = datetime.now()
-                    next_update = self.channel_states[channel_id][interval]['last_scheduled_update'] + timedelta(seconds=interval)
-                    next_update_str = next_update.strftime('%H:%M:%S WIB')
-
-                    # Generate table image
-                    logger.debug(f"🎨 Generating table image for channel {channel_id} interval {interval}s...")
-                    table_image = generate_table_image(table_data, session_name, weight, last_updated, TABLE_FOOTER_TEXT, interval_str, next_update_str)
-
-                    # Create embed with image
-                    # Get flag emoji for session
-                    session_flag = get_session_flag(session_name)
-                    
-                    # Get next session info
-                    next_session_name, next_session_time = get_next_session_info()
-                    next_session_flag = get_session_flag(next_session_name)
-                    
-                    embed = discord.Embed(
-                        title=f"BYBIT FUTURES VWAP SCANNER - UPDATED EVERY {interval_str.upper()}",
-                        description=f"**Current Session:** {session_name} {session_flag}\n**Weight:** {weight}\n**Last Updated:** {last_updated}\n**Next Update:** {next_update_str}\n**Next Session:** {next_session_name} {next_session_flag} at {next_session_time}",
-                        color=discord.Color.blue()
-                    )
-
-                    # Create file attachment
-                    filename = f"vwap_scanner_{interval}s_{datetime.utcnow().strftime('%H%M%S')}.png"
-                    file = discord.File(table_image, filename=filename)
-
-                    # Set image in embed
-                    embed.set_image(url=f"attachment://{filename}")
-
-                    # Add footer if configured
-                    if EMBED_FOOTER_TEXT:
-                        embed.set_footer(text=EMBED_FOOTER_TEXT)
-
-                    message = self.channel_states[channel_id][interval]['message']
-                    await message.edit(embed=embed, attachments=[file])
-                    logger.info(f"✅ Table image updated in channel {channel_id} interval {interval}s")
-                elif channel_id in self.channel_states and interval in self.channel_states[channel_id]:
-                    logger.warning(f"⚠️ No data to update in channel {channel_id} interval {interval}s")
-
-            except discord.NotFound:
-                logger.error(f"❌ Message not found in channel {channel_id} interval {interval}s, stopping updates")
-                if channel_id in self.channel_states and interval in self.channel_states[channel_id]:
-                    self.channel_states[channel_id][interval]['running'] = False
-                    del self.channel_states[channel_id][interval]
-                    # Clean up empty channel entry
-                    if not self.channel_states[channel_id]:
-                        del self.channel_states[channel_id]
-                break
-            except Exception as e:
-                logger.error(f"❌ Error updating message in channel {channel_id} interval {interval}s: {e}")
-                import traceback
-                traceback.print_exc()
-                if channel_id in self.channel_states and interval in self.channel_states[channel_id]:
-                    self.channel_states[channel_id][interval]['running'] = False
-                    del self.channel_states[channel_id][interval]
-                    # Clean up empty channel entry
-                    if not self.channel_states[channel_id]:
-                        del self.channel_states[channel_id]
-                break
-
-            # Wait before next update - with timer reset support
-            logger.debug(f"⏰ Waiting {interval} seconds before next update for channel {channel_id} (next update ~{(datetime.now() + timedelta(seconds=interval)).strftime('%H:%M:%S')} WIB)...")
-            
-            # Wait for either timeout or reset event
-            reset_event = self.channel_states[channel_id][interval]['reset_timer_event']
-            try:
-                await asyncio.wait_for(reset_event.wait(), timeout=interval)
-                # Event was set - timer reset requested (session change)
-                logger.info(f"🔄 Timer reset triggered for channel {channel_id} interval {interval}s (session change)")
-                reset_event.clear()  # Clear the event for next time
-                logger.debug(f"⏰ Timer reset complete, continuing to next update...")
-            except asyncio.TimeoutError:
-                # Normal timeout - interval elapsed
-                logger.debug(f"⏰ Sleep completed for channel {channel_id} interval {interval}s, starting next update...")
-                pass
+                logger.debug("🔁 Scheduler iteration #%d for interval %ds", loop_count, interval)
+
+                try:
+                    await self.update_interval(interval)
+                except Exception as e:
+                    logger.error(f"❌ Error updating scanners for interval {interval}s: {e}")
+                    traceback.print_exc()
+
+                # Wait before next update - with timer reset support
+                if logger.isEnabledFor(logging.DEBUG):
+                    next_update = datetime.now(WIB) + timedelta(seconds=interval)
+                    logger.debug("⏰ Waiting %d seconds before next update for interval %ds (next update ~%s WIB)...", interval, interval, f"{next_update:%H:%M:%S}")
+
+                # Wait for either timeout or reset event
+                try:
+                    await asyncio.wait_for(reset_event.wait(), timeout=interval)
+                    # Event was set - timer reset requested (session change or new subscriber)
+                    logger.info(f"🔄 Timer reset triggered for interval {interval}s")
+                    reset_event.clear()  # Clear the event for next time
+                except asyncio.TimeoutError:
+                    # Normal timeout - interval elapsed
+                    logger.debug("⏰ Sleep completed for interval %ds, starting next update...", interval)
+        finally:
+            self.interval_schedulers.pop(interval, None)
+            logger.info(f"⏹️ Scheduler stopped for interval {interval}s")
+
+    async def update_interval(self, interval):
+        """Fetch and render the table once, then update every channel subscribed to the interval"""
+        logger.debug("📊 Getting scanner data for interval %ds...", interval)
+        # Get updated data from callback
+        table_text = await self.update_callback()
+        logger.debug("✅ Got scanner data (%d chars)", len(table_text) if table_text else 0)
+
+        if not table_text:
+            logger.warning(f"⚠️ No data to update for interval {interval}s")
+            return
+
+        # Read the clock once per tick; WIB is derived from it rather than from the container timezone
+        now_utc = datetime.now(timezone.utc)
+        now_wib = now_utc.astimezone(WIB)
+
+        # Handle both old format (string) and new format (tuple)
+        if isinstance(table_text, tuple):
+            table_data, last_updated = table_text
+        else:
+            table_data = table_text
+            last_updated = f"{now_wib:%H:%M:%S} WIB | {now_utc:%H:%M:%S} UTC"
+
+        # Parse session info from table_data
+        session_name = "UNKNOWN"
+        weight = "0.0"
+        if isinstance(table_data, str):
+            match = SESSION_LINE_RE.search(table_data, 0, SESSION_LINE_SEARCH_END)
+            if match:
+                session_name = match.group(1).strip()
+                weight = match.group(2).strip()
+
+        interval_str = format_interval(interval)
+
+        # Calculate next update
+        next_update_str = f"{now_wib + timedelta(seconds=interval):%H:%M:%S} WIB"
+
+        # Generate table image
+        logger.debug("🎨 Generating table image for interval %ds...", interval)
+        render_args = (table_data, session_name, weight, last_updated, TABLE_FOOTER_TEXT, interval_str, next_update_str)
+        image_bytes = await render_table_image(*render_args)
+
+        # Get next session info
+        next_session_name, next_session_time = get_next_session_info()
+
+        # Create embed with image from the (interval, session) template
+        filename = f"vwap_scanner_{interval}s_{now_utc:%H%M%S}.png"
+        embed = _scanner_embed(
+            interval_str, session_name, filename,
+            weight=weight,
+            last_updated=last_updated,
+            next_update=next_update_str,
+            next_session=f"{next_session_name} {get_session_flag(next_session_name)} at {next_session_time}"
+        )
+
+        scheduler = self.interval_schedulers.get(interval)
+        if scheduler:
+            scheduler['last_update'] = (embed, image_bytes, filename)
+
+        # Subscribers are collected after the awaits above, so channels stopped meanwhile are skipped.
+        # Each edit runs as its own task stored in the state, letting !stop cancel and await it.
+        subscribers = self.interval_subscribers(interval)
+        for channel_id, interval_state in subscribers:
+            interval_state['task'] = asyncio.create_task(
+                self.update_channel_message(channel_id, interval, interval_state, embed, image_bytes, filename),
+                name=f"vwap-{channel_id}-{interval}"
+            )
+        await asyncio.gather(*(interval_state['task'] for _, interval_state in subscribers), return_exceptions=True)
+        logger.info(f"✅ Table image for interval {interval}s sent to {len(subscribers)} channel(s)")
+
+    async def update_channel_message(self, channel_id, interval, interval_state, embed, image_bytes, filename):
+        """Edit one channel's scanner message with the rendered table"""
+        try:
+            logger.debug("📤 Updating message in channel %s interval %ds", channel_id, interval)
+            # Create file attachment (each edit consumes its own file object)
+            file = discord.File(BytesIO(image_bytes), filename=filename)
+            await interval_state['message'].edit(embed=embed, attachments=[file])
+            logger.debug("✅ Table image updated in channel %s interval %ds", channel_id, interval)
+
+        except discord.NotFound:
+            logger.error(f"❌ Message not found in channel {channel_id} interval {interval}s, stopping updates")
+            self.remove_interval_state(channel_id, interval, interval_state)
+        except Exception as e:
+            logger.error(f"❌ Error updating message in channel {channel_id} interval {interval}s: {e}")
+            traceback.print_exc()
+            self.remove_interval_state(channel_id, interval, interval_state)
 
     async def monitor_session_changes(self):
         """Monitor for trading session changes and trigger updates"""
@@ -536,7 +674,7 @@ class VWAPBot(commands.Bot):
                 
                 # Detect current session
                 new_session, new_weight = detect_session()
-                logger.debug(f"🔍 Session check: Current={self.current_session}, Detected={new_session}, Weight={new_weight}")
+                logger.debug("🔍 Session check: Current=%s, Detected=%s, Weight=%s", self.current_session, new_session, new_weight)
                 
                 # Check if session changed
                 if new_session != self.current_session:
@@ -546,35 +684,48 @@ class VWAPBot(commands.Bot):
                     
                     # Trigger immediate update for all active channels
                     logger.info("🚀 Triggering session change updates for all scanners...")
-                    await self.trigger_all_updates()
+                    await self.trigger_all_updates(force=True)
                 else:
-                    logger.debug(f"✅ Session unchanged: {self.current_session}")
+                    logger.debug("✅ Session unchanged: %s", self.current_session)
                     
             except Exception as e:
                 logger.error(f"❌ Error in session monitoring: {e}")
-                import traceback
                 traceback.print_exc()
                 await asyncio.sleep(60)  # Continue monitoring even if error
     
-    async def trigger_all_updates(self):
-        """Trigger immediate update for all active channels/intervals"""
+    async def trigger_all_updates(self, force=False):
+        """Trigger immediate update for all active channels/intervals
+
+        Args:
+            force: Trigger even if the previous trigger was less than TRIGGER_COOLDOWN seconds ago
+
+        Returns:
+            True if update signals were sent, False if skipped
+        """
         if not self.channel_states:
             logger.info("ℹ️ No active channels to update")
-            return
+            return False
+
+        # Check-and-set happens without an await in between, so concurrent callers cannot both pass
+        now = time.monotonic()
+        if not force and now - self.last_trigger_time < TRIGGER_COOLDOWN:
+            logger.info("ℹ️ Scanners were triggered moments ago, skipping duplicate trigger")
+            return False
+        self.last_trigger_time = now
         
-        logger.info(f"🚀 Triggering updates for {sum(len(intervals) for intervals in self.channel_states.values())} active scanner(s)")
+        logger.info(f"🚀 Triggering updates for {self.active_scanner_count} active scanner(s)")
         
-        # Collect all update tasks
-        update_tasks = []
-        for channel_id, intervals in self.channel_states.items():
-            for interval in intervals:
-                if self.channel_states[channel_id][interval]['running']:
-                    # Signal timer reset for this channel/interval
-                    reset_event = self.channel_states[channel_id][interval]['reset_timer_event']
-                    reset_event.set()
-                    logger.debug(f"🔄 Timer reset signal sent for channel {channel_id} interval {interval}s")
+        # Signal every interval scheduler, which updates all of its channels
+        for interval, scheduler in self.interval_schedulers.items():
+            scheduler['reset_timer_event'].set()
+            logger.debug("🔄 Timer reset signal sent for interval %ds", interval)
         
         logger.info(f"✅ Timer reset signals sent to all active scanners")
+        return True
+
+    def channel_lock(self, channel_id):
+        """Get the lock serializing start/stop commands for a channel"""
+        return self.channel_locks.setdefault(channel_id, asyncio.Lock())
 
     def set_update_callback(self, callback):
         """Set the callback function to get updated data"""
@@ -582,19 +733,26 @@ class VWAPBot(commands.Bot):
 
     async def close(self):
         """Cleanup when bot is shutting down"""
-        # Cancel session monitoring task
+        # Collect the session monitor, every interval scheduler and all in-flight message updates
+        tasks = [
+            state['task']
+            for intervals in self.channel_states.values()
+            for state in intervals.values()
+            if state['task'] and not state['task'].done()
+        ]
+        tasks.extend(task for task in self.background_tasks if not task.done())
         if self.session_check_task and not self.session_check_task.done():
-            self.session_check_task.cancel()
-            logger.info("🛑 Cancelled session monitoring task")
-        
-        # Cancel all running update tasks
-        for channel_id, intervals in self.channel_states.items():
-            for interval, state in intervals.items():
-                if state['task'] and not state['task'].done():
-                    state['task'].cancel()
-                    logger.info(f"🛑 Cancelled update task for channel {channel_id} interval {interval}s")
+            tasks.append(self.session_check_task)
+
+        # Cancel them all at once, then wait for all to unwind before the connection closes
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"🛑 Cancelled {len(tasks)} background task(s)")
 
         self.channel_states.clear()
+        self.active_scanner_count = 0
+        await close_render_executor()
         await super().close()
 
 # Global bot instance
@@ -615,143 +773,165 @@ async def on_ready():
 @bot.command(name="start")
 async def start_command(ctx):
     """Start VWAP scanner - Usage: !start"""
+    async with bot.channel_lock(ctx.channel.id):
+        await start_scanner(ctx)
+
+async def start_scanner(ctx):
+    """Start scanners for all configured intervals in the command's channel"""
     logger.info(f"🚀 VWAP BOT v2.0 - !start command received from {ctx.author}")
 
     channel_id = ctx.channel.id
     logger.info(f"📝 Start command - Channel ID: {channel_id}, Guild: {ctx.guild.name if ctx.guild else 'DM'} (ID: {ctx.guild.id if ctx.guild else 'N/A'})")
 
-    # Parse intervals from config
-    intervals = parse_intervals(REFRESH_INTERVAL)
-    logger.info(f"📊 Parsed intervals: {intervals} ({', '.join(format_interval(i) for i in intervals)})")
+    # Intervals from config (parsed once at import)
+    intervals = PARSED_INTERVALS
+    interval_strs = [format_interval(i) for i in intervals]
+    intervals_str = ', '.join(interval_strs)
+    logger.info(f"📊 Parsed intervals: {intervals} ({intervals_str})")
 
     # Check if already running in this channel
-    if channel_id in bot.channel_states:
-        existing_intervals = list(bot.channel_states[channel_id].keys())
-        if existing_intervals:
-            logger.warning(f"⚠️ Scanner already running in channel {channel_id} with intervals: {existing_intervals}")
-            await ctx.message.add_reaction("⚠️")
-            intervals_str = ', '.join(format_interval(i) for i in existing_intervals)
-            await ctx.send(f"🔄 VWAP scanner is already running in this channel!\nActive intervals: {intervals_str}")
-            return
+    existing = bot.channel_states.get(channel_id)
+    if existing:
+        existing_intervals = list(existing.keys())
+        logger.warning(f"⚠️ Scanner already running in channel {channel_id} with intervals: {existing_intervals}")
+        active_intervals_str = ', '.join(s['interval_str'] for s in existing.values())
+        await asyncio.gather(
+            ctx.message.add_reaction("⚠️"),
+            ctx.send(f"🔄 VWAP scanner is already running in this channel!\nActive intervals: {active_intervals_str}")
+        )
+        return
 
+    # Interval states and messages created by this command, undone if any step fails
+    added_states = []
+    messages = []
     try:
+        server_name = ctx.guild.name if ctx.guild else "DM"
+        guild_id = ctx.guild.id if ctx.guild else None
+
         # React with checkmark to confirm command received
         await ctx.message.add_reaction("✅")
 
-        # Initialize channel state structure
-        if channel_id not in bot.channel_states:
-            bot.channel_states[channel_id] = {}
-
-        server_name = ctx.guild.name if ctx.guild else "DM"
-        guild_id = ctx.guild.id if ctx.guild else None
+        # Initial messages are sent one by one so they appear in interval order
+        logger.info(f"📤 Creating messages for {len(intervals)} interval(s)...")
+        for interval_str in interval_strs:
+            messages.append(await ctx.send(embed=_starting_embed(interval_str)))
 
-        # Create a message and start update loop for each interval
-        for interval in intervals:
-            interval_str = format_interval(interval)
-            logger.info(f"📤 Creating message for interval {interval}s ({interval_str})...")
-            
-            # Send initial message
-            embed = discord.Embed(
-                title=f"VWAP Scanner [{interval_str}]",
-                description=f"Starting VWAP scanner with {interval_str} refresh interval...\nLoading data...",
-                color=discord.Color.blue()
-            )
+        # Channel state structure (created on first access)
+        state = bot.channel_states[channel_id]
 
-            # Send the initial message and get the message object
-            message = await ctx.send(embed=embed)
+        # Register state and subscribe each interval to its scheduler
+        state_rows = []
+        for interval, interval_str, message in zip(intervals, interval_strs, messages):
             logger.info(f"✅ Initial message sent for {interval_str}, message ID: {message.id}")
 
             # Initialize interval state
-            bot.channel_states[channel_id][interval] = {
+            interval_state = {
                 'message': message,
                 'running': True,
                 'task': None,
-                'last_scheduled_update': datetime.now(),  # Track scheduled update time
-                'reset_timer_event': asyncio.Event()  # Event to signal timer reset
+                'interval_str': interval_str  # Precomputed display string
             }
+            state[interval] = interval_state
+            bot.active_scanner_count += 1
+            added_states.append((interval, interval_state))
 
-            # Save state to database
-            save_channel_state(channel_id, interval, message.id, True, server_name, ctx.channel.name, guild_id)
+            state_rows.append((channel_id, interval, message.id, True, server_name, ctx.channel.name, guild_id))
 
-            # Start the update loop for this interval
-            logger.info(f"🔄 Starting update loop for channel {channel_id} interval {interval}s")
-            task = asyncio.create_task(bot.update_loop_for_channel(channel_id, interval))
-            bot.channel_states[channel_id][interval]['task'] = task
+            # Subscribe to the shared scheduler for this interval
+            logger.info(f"🔄 Subscribing channel {channel_id} to interval {interval}s")
+            bot.subscribe_interval(channel_id, interval, interval_state)
+
+        # Save all interval states to database in one transaction, off the event loop
+        await asyncio.to_thread(save_channel_states_bulk, state_rows)
 
-        intervals_str = ', '.join(format_interval(i) for i in intervals)
         logger.info(f"✅ VWAP scanner started in channel: {ctx.channel.name} (ID: {channel_id}) with {len(intervals)} interval(s): {intervals_str}")
 
     except Exception as e:
         logger.error(f"❌ Error in start_command: {e}")
-        import traceback
         traceback.print_exc()
+
+        # Roll back the partial start: no half-registered scanners or orphaned messages
+        for interval, interval_state in added_states:
+            bot.remove_interval_state(channel_id, interval, interval_state)
+            if interval_state['task']:
+                interval_state['task'].cancel()
+        await asyncio.gather(*(message.delete() for message in messages), return_exceptions=True)
+
         try:
-            await ctx.message.add_reaction("❌")
-            await ctx.send(f"❌ Error starting scanner: {str(e)[:100]}")
+            await asyncio.gather(
+                ctx.message.add_reaction("❌"),
+                ctx.send(f"❌ Error starting scanner: {str(e)[:100]}")
+            )
         except Exception as followup_error:
             logger.error(f"❌ Failed to send error message: {followup_error}")
 
 @bot.command(name="stop")
 async def stop_command(ctx):
     """Stop VWAP scanner - Usage: !stop"""
+    async with bot.channel_lock(ctx.channel.id):
+        await stop_scanner(ctx)
+
+async def stop_scanner(ctx):
+    """Stop all scanners running in the command's channel"""
     logger.info(f"📥 !stop command received from {ctx.author}")
     channel_id = ctx.channel.id
 
-    if channel_id not in bot.channel_states or not bot.channel_states[channel_id]:
+    # Take the channel's state out in a single step
+    state = bot.channel_states.pop(channel_id, None)
+    if not state:
         logger.warning(f"⚠️ No scanner running in channel {channel_id}")
-        await ctx.message.add_reaction("⚠️")
-        await ctx.send("❌ VWAP scanner is not running in this channel!")
+        await asyncio.gather(
+            ctx.message.add_reaction("⚠️"),
+            ctx.send("❌ VWAP scanner is not running in this channel!")
+        )
         return
+    bot.active_scanner_count -= len(state)
 
     try:
         logger.info(f"🛑 Stopping scanner in channel {channel_id}")
         
-        # Get list of intervals before we start modifying
-        intervals_to_stop = list(bot.channel_states[channel_id].keys())
+        intervals_to_stop = list(state.keys())
+        intervals_str = ', '.join(s['interval_str'] for s in state.values())
         
         # Stop all intervals for this channel
-        for interval in intervals_to_stop:
-            interval_str = format_interval(interval)
+        for interval, interval_state in state.items():
+            interval_str = interval_state['interval_str']
             logger.info(f"🛑 Stopping interval {interval}s ({interval_str})")
             
             # Stop the scanner for this interval
-            bot.channel_states[channel_id][interval]['running'] = False
-
-            # Cancel the update task
-            if bot.channel_states[channel_id][interval]['task']:
-                bot.channel_states[channel_id][interval]['task'].cancel()
-                logger.info(f"✅ Update task cancelled for {interval_str}")
-
-            # Edit the message to show stopped state without image
-            embed = discord.Embed(
-                title=f"VWAP Scanner [{interval_str}]",
-                description=f"VWAP scanner stopped",
-                color=discord.Color.red()
-            )
-
-            message = bot.channel_states[channel_id][interval]['message']
-            await message.edit(embed=embed, attachments=[])
-            logger.info(f"✅ Message edited to stopped state for {interval_str}")
-
-        # React with checkmark to confirm command received
-        await ctx.message.add_reaction("✅")
-
-        # Clean up channel state
-        del bot.channel_states[channel_id]
+            interval_state['running'] = False
+
+            # Cancel any in-flight update of this channel's message
+            task = interval_state['task']
+            if task and not task.done():
+                task.cancel()
+                logger.info(f"✅ Pending update cancelled for {interval_str}")
+
+        # Wait for the cancelled updates to unwind before touching their messages
+        tasks = [s['task'] for s in state.values() if s['task']]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Edit all messages to show stopped state without image and react with
+        # checkmark to confirm the command, concurrently
+        await asyncio.gather(
+            ctx.message.add_reaction("✅"),
+            *(s['message'].edit(embed=_stopped_embed(s['interval_str']), attachments=[]) for s in state.values())
+        )
+        logger.info(f"✅ Messages edited to stopped state for {len(intervals_to_stop)} interval(s)")
 
         # Remove from database (all intervals)
-        remove_channel_state(channel_id)
+        await asyncio.to_thread(remove_channel_state, channel_id)
 
-        intervals_str = ', '.join(format_interval(i) for i in intervals_to_stop)
         logger.info(f"⏹️ VWAP scanner stopped in channel: {ctx.channel.name} (ID: {channel_id}) - {len(intervals_to_stop)} interval(s): {intervals_str}")
 
     except Exception as e:
         logger.error(f"❌ Error in stop_command: {e}")
-        import traceback
         traceback.print_exc()
         try:
-            await ctx.message.add_reaction("❌")
-            await ctx.send(f"❌ Error stopping scanner: {str(e)[:100]}")
+            await asyncio.gather(
+                ctx.message.add_reaction("❌"),
+                ctx.send(f"❌ Error stopping scanner: {str(e)[:100]}")
+            )
         except Exception as followup_error:
             logger.error(f"❌ Failed to send error message: {followup_error}")
 
@@ -761,10 +941,11 @@ async def session_command(ctx):
     logger.info(f"📊 !session command received from {ctx.author}")
     
     try:
-        # Get current session
+        # Count active scanners
+        active_count = bot.active_scanner_count
+
+        # Get current and next session info (both cached per UTC hour)
         current_session, weight = detect_session()
-        
-        # Get next session info
         next_session_name, next_session_time = get_next_session_info()
         
         # Get session flags
@@ -781,21 +962,22 @@ async def session_command(ctx):
             color=discord.Color.blue()
         )
         
-        # Count active scanners
-        active_count = sum(len(intervals) for intervals in bot.channel_states.values())
         embed.add_field(name="Active Scanners", value=f"{active_count} scanner(s) running", inline=False)
         
         await ctx.send(embed=embed)
-        
-        # Trigger manual update for all scanners
-        if active_count > 0:
-            await ctx.send("🔄 Triggering manual update for all scanners...")
-            await bot.trigger_all_updates()
-            await ctx.send("✅ Manual update completed!")
+
+        # Nothing to update when no scanner is running
+        if active_count == 0:
+            return
+
+        # Trigger manual update for all scanners (skipped if one was just triggered)
+        if await bot.trigger_all_updates():
+            await ctx.send("✅ Manual update triggered for all scanners!")
+        else:
+            await ctx.send("ℹ️ Scanners were updated moments ago, skipping manual update")
         
     except Exception as e:
         logger.error(f"❌ Error in session_command: {e}")
-        import traceback
         traceback.print_exc()
         await ctx.send(f"❌ Error: {str(e)}")
 
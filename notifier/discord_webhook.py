@@ -1,8 +1,9 @@
 # notifier/discord_webhook.py
 
-import requests
+import asyncio
 import logging
 from config import DISCORD_WEBHOOK_URL
+from utils.http_client import get_session
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -12,29 +13,47 @@ handler.setFormatter(formatter)
 logger.addHandler(handler)
 
 MAX_DISCORD_CHARS = 1800  # buffer aman
-
-def send_table(table_text: str):
+MAX_RETRIES = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+async def post_chunk(payload: dict):
+    """POST one chunk, retrying 429 / 5xx. Returns (status, body)"""
+    # Session dipakai bersama (keep-alive), jadi chunk berikutnya tidak handshake ulang
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        async with session.post(DISCORD_WEBHOOK_URL, json=payload) as r:
+            if r.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return r.status, await r.text()
+
+            if r.status == 429:
+                # Discord kasih tahu berapa lama harus menunggu
+                data = await r.json(content_type=None)
+                delay = float(data.get("retry_after", 1))
+            else:
+                delay = 0.2 * (2 ** attempt)
+
+        logger.warning(f"Discord {r.status}, retry dalam {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+async def send_table(table_text: str):
     if not DISCORD_WEBHOOK_URL:
         logger.warning("Discord webhook URL kosong")
         return
 
-    chunks = [
-        table_text[i:i + MAX_DISCORD_CHARS]
-        for i in range(0, len(table_text), MAX_DISCORD_CHARS)
-    ]
+    # Chunk di-slice satu per satu saat dikirim (bukan list semua chunk),
+    # jadi hanya satu salinan chunk yang hidup di memori
+    total_chunks = -(-len(table_text) // MAX_DISCORD_CHARS)
 
-    for idx, chunk in enumerate(chunks, 1):
+    # Chunk dikirim berurutan (bukan gather) karena tiap chunk jadi pesan sendiri
+    # dan urutan tabel harus tetap; tetap async supaya event loop tidak ke-block
+    for idx, start in enumerate(range(0, len(table_text), MAX_DISCORD_CHARS), 1):
         payload = {
-            "content": f"```\n{chunk}\n```"
+            "content": f"```\n{table_text[start:start + MAX_DISCORD_CHARS]}\n```"
         }
 
-        r = requests.post(
-            DISCORD_WEBHOOK_URL,
-            json=payload,
-            timeout=10
-        )
+        status, text = await post_chunk(payload)
 
-        if r.status_code not in (200, 204):
-            logger.error(f"Discord error: {r.status_code} {r.text}")
+        if status not in (200, 204):
+            logger.error(f"Discord error: {status} {text}")
         else:
-            logger.info(f"Discord chunk {idx}/{len(chunks)} sent")
+            logger.info(f"Discord chunk {idx}/{total_chunks} sent")
@@ -11,13 +11,13 @@ class C:
 
     BOLD = "\033[1m"
 
+# Colored signal strings are static, so build them once
+_COLOR_SIG = {
+    "STRONG BUY": f"{C.BOLD}{C.GREEN}STRONG BUY{C.RESET}",
+    "BUY": f"{C.GREEN}BUY{C.RESET}",
+    "STRONG SELL": f"{C.BOLD}{C.RED}STRONG SELL{C.RESET}",
+    "SELL": f"{C.RED}SELL{C.RESET}",
+}
+
 def color_signal(signal):
-    if signal == "STRONG BUY":
-        return f"{C.BOLD}{C.GREEN}{signal}{C.RESET}"
-    if signal == "BUY":
-        return f"{C.GREEN}{signal}{C.RESET}"
-    if signal == "STRONG SELL":
-        return f"{C.BOLD}{C.RED}{signal}{C.RESET}"
-    if signal == "SELL":
-        return f"{C.RED}{signal}{C.RESET}"
-    return f"{C.YELLOW}{signal}{C.RESET}"
+    return _COLOR_SIG.get(signal) or f"{C.YELLOW}{signal}{C.RESET}"
@@ -16,17 +16,32 @@ handler.setFormatter(formatter)
 # Add handler to logger
 logger.addHandler(handler)
 
+# Row layout matching the header columns; applied with str.format per row
+ROW_FMT = (
+    "{:<5} {:<14} {:<20} "
+    "{:<8.2f} {:<11.6g} {:<11.6g} "
+    "{:<7.2f} {:<6.1f} {:<7.2f} {:<6.1f}"
+)
+
+_SIGNAL_ICONS = {
+    "STRONG BUY": "🟢🔥",
+    "BUY": "🟢",
+    "NEUTRAL": "⚪",
+    "SELL": "🔴",
+    "STRONG SELL": "🔴🔥"
+}
+
+# "<icon> <signal>" labels prebuilt so each row is a single dict lookup
+_SIGNAL_PREFIX = {k: f"{v} {k}" for k, v in _SIGNAL_ICONS.items()}
+
 def signal_icon(signal):
-    return {
-        "STRONG BUY": "🟢🔥",
-        "BUY": "🟢",
-        "NEUTRAL": "⚪",
-        "SELL": "🔴",
-        "STRONG SELL": "🔴🔥"
-    }.get(signal, "")
+    return _SIGNAL_ICONS.get(signal, "")
+
+def signal_label(signal):
+    return _SIGNAL_PREFIX.get(signal) or f" {signal}"
 
 
-def render_table(rows, session, weight):
+def render_table(rows, session, weight, sink=logger.info):
     lines = []
     lines.append("BYBIT FUTURES VWAP SESSION SCANNER")
     lines.append(f"Session : {session} | Weight : {weight}")
@@ -36,16 +51,18 @@ def render_table(rows, session, weight):
     )
     lines.append("-" * 150)
 
-    for i, r in enumerate(rows, 1):
-        sig = f"{signal_icon(r['signal'])} {r['signal']}"
-        lines.append(
-            f"{i:<5} {r['symbol']:<14} {sig:<20} "
-            f"{r['score']:<8.2f} {r['price']:<11.6g} {r['vwap']:<11.6g} "
-            f"{r['volume_m']:<7.2f} {r['rsi']:<6.1f} {r['macd']:<7.2f} {r['stoch']:<6.1f}"
+    fmt = ROW_FMT.format
+    lines.extend([
+        fmt(
+            i, r['symbol'], signal_label(r['signal']),
+            r['score'], r['price'], r['vwap'],
+            r['volume_m'], r['rsi'], r['macd'], r['stoch']
         )
+        for i, r in enumerate(rows, 1)
+    ])
 
     lines.append("=" * 150)
 
     table_text = "\n".join(lines)
-    logger.info(table_text)      # Terminal
+    sink(table_text)      # Terminal
     return table_text      # Discord
@@ -5,10 +5,26 @@ Separated to avoid circular imports
 
 import sqlite3
 import os
+import atexit
+import threading
 import logging
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 
 # Database setup
 DB_PATH = '/app/data/bot_states.db' if os.path.exists('/app') else 'bot_states.db'
+# Ensure directory exists once at import (only needed for Docker path)
+os.makedirs(os.path.dirname(DB_PATH) or '.', exist_ok=True)
+
+# Stored in PRAGMA user_version once init_rankings_table has brought the table up to date
+RANKINGS_SCHEMA_VERSION = 2
+
+# One connection is reused for the life of the process. Rankings are only read and written
+# by the render worker, one render at a time; db_lock is reentrant so that batch() can hold
+# it across the load/save calls that take it themselves
+_connection = None
+db_lock = threading.RLock()
+_batch_depth = 0
 
 # Set up custom logging with file details
 logger = logging.getLogger(__name__)
@@ -25,16 +41,15 @@ handler.setFormatter(formatter)
 # Add handler to logger
 logger.addHandler(handler)
 
-def init_rankings_table():
+def init_rankings_table(conn):
     """Initialize the rankings table if it doesn't exist, or migrate if needed"""
-    # Ensure directory exists (only needed for Docker path)
-    db_dir = os.path.dirname(DB_PATH)
-    if db_dir:
-        os.makedirs(db_dir, exist_ok=True)
-
-    conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    # Databases already at the current schema skip the sqlite_master / PRAGMA introspection below
+    cursor.execute('PRAGMA user_version')
+    if cursor.fetchone()[0] >= RANKINGS_SCHEMA_VERSION:
+        return
+
     # Check if table exists and get its schema
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='previous_rankings'")
     table_exists = cursor.fetchone() is not None
@@ -141,8 +156,68 @@ def init_rankings_table():
             )
         ''')
 
+    # Covering index for the per-(session, interval) scan lookups: both the scan_time
+    # subquery and the row fetch in load_previous_rankings are answered from the index
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_rankings_sess_int_time
+        ON previous_rankings(session_name, interval, scan_time DESC, symbol, rank)
+    ''')
+
+    cursor.execute(f'PRAGMA user_version = {RANKINGS_SCHEMA_VERSION}')
     conn.commit()
-    conn.close()
+
+def get_connection():
+    """Get the shared rankings connection, opening it and preparing the table on first use
+
+    Callers must hold db_lock.
+    """
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(DB_PATH, check_same_thread=False)
+        # Rankings are regenerated every scan, so WAL with synchronous=NORMAL (no fsync per commit) is safe here
+        _connection.execute('PRAGMA journal_mode=WAL')
+        _connection.execute('PRAGMA synchronous=NORMAL')
+        _connection.execute('PRAGMA temp_store=MEMORY')
+        _connection.execute('PRAGMA cache_size=-20000')
+        init_rankings_table(_connection)
+        atexit.register(_connection.close)
+    return _connection
+
+# OR REPLACE lets a rescan within the same second (identical CURRENT_TIMESTAMP)
+# overwrite that scan's rows instead of failing on UNIQUE(session_name, interval, symbol, scan_time)
+INSERT_RANKING_SQL = '''
+    INSERT OR REPLACE INTO previous_rankings (session_name, interval, symbol, rank, scan_time)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+
+# SQLITE_MAX_VARIABLE_NUMBER is 999 on builds older than 3.32; 4 bound values per row
+MAX_ROWS_PER_INSERT = 999 // 4
+
+@lru_cache(maxsize=8)
+def insert_rankings_sql(row_count: int) -> str:
+    """Multi-row INSERT for row_count rankings (same text per size, so sqlite3 reuses the prepared statement)"""
+    return (
+        'INSERT OR REPLACE INTO previous_rankings (session_name, interval, symbol, rank, scan_time) VALUES '
+        + ','.join(['(?, ?, ?, ?, CURRENT_TIMESTAMP)'] * row_count)
+    )
+
+@contextmanager
+def batch():
+    """Run the enclosed loads and saves under one lock hold and one transaction, committed on exit"""
+    global _batch_depth
+    with db_lock:
+        conn = get_connection()
+        _batch_depth += 1
+        try:
+            yield
+            if _batch_depth == 1:
+                conn.commit()
+        except BaseException:
+            if _batch_depth == 1:
+                conn.rollback()
+            raise
+        finally:
+            _batch_depth -= 1
 
 def save_previous_rankings(session_name: str, rankings: list, interval: int = 120):
     """Save current rankings for a session and interval to database
@@ -152,34 +227,36 @@ def save_previous_rankings(session_name: str, rankings: list, interval: int = 12
         rankings: List of (symbol, rank) tuples
         interval: Refresh interval in seconds (default: 120)
     """
-    init_rankings_table()  # Ensure table exists
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # DELETE and the batched INSERT run in one transaction, committed on exit (or by the enclosing batch())
+    with db_lock:
+        conn = get_connection()
+        with nullcontext() if _batch_depth else conn:
+            cursor = conn.cursor()
 
-    # Delete old rankings (keep only last 2 scans for comparison)
-    # Keep the most recent scan for next comparison, delete older ones
-    cursor.execute('''
-        DELETE FROM previous_rankings 
-        WHERE session_name = ? AND interval = ? 
-        AND scan_time < (
-            SELECT MAX(scan_time) 
-            FROM previous_rankings 
-            WHERE session_name = ? AND interval = ?
-        )
-    ''', (session_name, interval, session_name, interval))
-
-    # Insert new rankings with current timestamp
-    for symbol, rank in rankings:
-        cursor.execute('''
-            INSERT INTO previous_rankings (session_name, interval, symbol, rank, scan_time)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (session_name, interval, symbol, rank))
+            # Delete old rankings (keep only last 2 scans for comparison)
+            # Keep the most recent scan for next comparison, delete older ones
+            cursor.execute('''
+                DELETE FROM previous_rankings 
+                WHERE session_name = ? AND interval = ? 
+                AND scan_time < (
+                    SELECT MAX(scan_time) 
+                    FROM previous_rankings 
+                    WHERE session_name = ? AND interval = ?
+                )
+            ''', (session_name, interval, session_name, interval))
 
-    conn.commit()
-    conn.close()
+            # Insert new rankings with current timestamp: one multi-row statement (one prepare/step,
+            # one CURRENT_TIMESTAMP for the whole scan) unless it would exceed SQLite's variable limit
+            if len(rankings) <= MAX_ROWS_PER_INSERT:
+                if rankings:
+                    cursor.execute(
+                        insert_rankings_sql(len(rankings)),
+                        [value for symbol, rank in rankings for value in (session_name, interval, symbol, rank)]
+                    )
+            else:
+                cursor.executemany(INSERT_RANKING_SQL, [(session_name, interval, symbol, rank) for symbol, rank in rankings])
 
-def load_previous_rankings(session_name: str, interval: int = 120) -> list:
+def load_previous_rankings(session_name: str, interval: int = 120) -> list[tuple[str, int]]:
     """Load the most recent previous rankings for a session and interval from database
     
     Args:
@@ -189,36 +266,25 @@ def load_previous_rankings(session_name: str, interval: int = 120) -> list:
     Returns:
         List of (symbol, rank) tuples from the PREVIOUS scan (not current)
     """
-    init_rankings_table()  # Ensure table exists
+    with db_lock:
+        cursor = get_connection().cursor()
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+        # Get rankings from the second-most recent scan (the previous one, not current);
+        # no previous scan means the subquery yields NULL and no rows match.
+        # GROUP BY scan_time collapses each scan to one row while walking the covering
+        # index in scan_time order (no temp B-tree), so OFFSET 1 lands on the previous scan
+        cursor.execute('''
+            SELECT symbol, rank FROM previous_rankings
+            WHERE session_name = ? AND interval = ? AND scan_time = (
+                SELECT scan_time
+                FROM previous_rankings
+                WHERE session_name = ? AND interval = ?
+                GROUP BY scan_time
+                ORDER BY scan_time DESC
+                LIMIT 1 OFFSET 1
+            )
+            ORDER BY rank
+        ''', (session_name, interval, session_name, interval))
 
-    # Get the second-most recent scan_time (the previous one, not current)
-    cursor.execute('''
-        SELECT DISTINCT scan_time 
-        FROM previous_rankings
-        WHERE session_name = ? AND interval = ?
-        ORDER BY scan_time DESC
-        LIMIT 1 OFFSET 1
-    ''', (session_name, interval))
-    
-    previous_scan_time_row = cursor.fetchone()
-    
-    # If no previous scan exists, return empty list
-    if not previous_scan_time_row:
-        conn.close()
-        return []
-    
-    previous_scan_time = previous_scan_time_row[0]
-    
-    # Get rankings from that previous scan
-    cursor.execute('''
-        SELECT symbol, rank FROM previous_rankings
-        WHERE session_name = ? AND interval = ? AND scan_time = ?
-        ORDER BY rank
-    ''', (session_name, interval, previous_scan_time))
-
-    rows = cursor.fetchall()
-    conn.close()
-    return [(symbol, rank) for symbol, rank in rows]
\ No newline at end of file
+        # Two-column SELECT on a plain (tuple-row) connection: already (symbol, rank) pairs
+        return cursor.fetchall()
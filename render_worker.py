@@ -0,0 +1,84 @@
+"""
+Table image rendering in a dedicated worker process
+Kept free of bot imports: the spawned worker only loads this module's dependencies
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from table_generator import generate_table_image, init_render_worker, flush_rankings_fallback
+
+# Set up custom logging with file details
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Create console handler
+handler = logging.StreamHandler()
+handler.setLevel(logging.INFO)
+
+# Create formatter with file details in brackets
+formatter = logging.Formatter('[%(filename)s:%(lineno)d] %(levelname)s: %(message)s')
+handler.setFormatter(formatter)
+
+# Add handler to logger
+logger.addHandler(handler)
+
+# Renders run in one dedicated worker process: it keeps fonts, figure and rankings state
+# warm between calls, and rasterizing never holds the bot process's GIL. spawn, not fork,
+# because the bot process is multi-threaded by the time the first render is requested.
+# The worker is the only process that renders, so it alone owns the rankings state
+_render_executor = None
+
+# Seconds close_render_executor waits for the worker to write out its rankings
+FLUSH_TIMEOUT = 10
+
+def get_render_executor() -> ProcessPoolExecutor:
+    """Get the render process pool, starting its single worker on first use"""
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_render_worker
+        )
+    return _render_executor
+
+def shutdown_render_executor(executor: ProcessPoolExecutor = None):
+    """Stop the render worker without waiting for a render in progress
+
+    Args:
+        executor: Only stop the pool if it is still this one (a broken pool another render already replaced is left alone)
+    """
+    global _render_executor
+    if _render_executor is not None and executor in (None, _render_executor):
+        _render_executor.shutdown(wait=False, cancel_futures=True)
+        _render_executor = None
+
+async def close_render_executor():
+    """Have the render worker write out its pending fallback rankings, then stop it"""
+    if _render_executor is None:
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        # Queued behind any render in progress; shutdown below would terminate the worker
+        # before its atexit flush runs and cancel anything still pending
+        await asyncio.wait_for(loop.run_in_executor(_render_executor, flush_rankings_fallback), FLUSH_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not flush rankings in the render worker: {e}")
+    shutdown_render_executor()
+
+async def render_table_image(*args) -> bytes:
+    """Generate the table image PNG bytes in the render worker process"""
+    loop = asyncio.get_running_loop()
+    executor = get_render_executor()
+    try:
+        return await loop.run_in_executor(executor, generate_table_image, *args)
+    except BrokenProcessPool:
+        # Worker crashed (e.g. OOM-killed): replace that pool, unless a render queued on it
+        # already did, and retry once on the current one
+        logger.warning("⚠️ Render worker died, restarting it and retrying the render")
+        shutdown_render_executor(executor)
+        return await loop.run_in_executor(get_render_executor(), generate_table_image, *args)
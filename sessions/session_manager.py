@@ -1,6 +1,7 @@
 from datetime import datetime, timezone as dt_timezone, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 from config import SESSION_WEIGHTS
-import pytz
 
 # Session definitions with local times (matching trading session notifier)
 SESSIONS_LOCAL = {
@@ -10,7 +11,10 @@ SESSIONS_LOCAL = {
     "New York":  (8, 17, "America/New_York")   # 08:00-17:00 EST/EDT
 }
 
-def detect_session():
+# Timezone objects resolved once instead of per detect_session() call
+_TZ = {name: ZoneInfo(tz) for name, (_, _, tz) in SESSIONS_LOCAL.items()}
+
+def detect_session(now_utc=None):
     """Detect current active session based on UTC time and local session definitions
     
     Priority order (highest weight first when multiple sessions active):
@@ -18,8 +22,18 @@ def detect_session():
     2. London (weight 1.0) - 07:00-16:00 UTC  
     3. Tokyo (weight 0.8) - 00:00-09:00 UTC
     4. Sydney (weight 0.6) - 23:00-08:00 UTC (overnight)
+
+    Args:
+        now_utc: Aware datetime to detect the session for (default: the current time)
     """
-    now_utc = datetime.now(dt_timezone.utc)
+    if now_utc is None:
+        now_utc = datetime.now(dt_timezone.utc)
+    # Result only changes on the hour, so it is cached per UTC hour bucket
+    return _detect_session_for_hour(now_utc.replace(minute=0, second=0, microsecond=0))
+
+@lru_cache(maxsize=8)
+def _detect_session_for_hour(now_utc):
+    """Detect the active session for an hour bucket (now truncated to the UTC hour)"""
     current_hour_utc = now_utc.hour
 
     # Check sessions in priority order (highest weight first)
@@ -27,10 +41,9 @@ def detect_session():
     session_priority = ["New York", "London", "Tokyo", "Sydney"]
     
     for session_name in session_priority:
-        start_local, end_local, tz_name = SESSIONS_LOCAL[session_name]
-        
-        # Calculate UTC hours for this session
-        utc_start, utc_end = get_utc_hours_for_session(start_local, end_local, tz_name, now_utc)
+        # Calculate UTC hours for this session (cached per local date)
+        local_date = now_utc.astimezone(_TZ[session_name]).date()
+        utc_start, utc_end = _session_utc_hours(session_name, local_date)
 
         # Check if current UTC hour falls within this session
         if utc_start < utc_end:
@@ -45,14 +58,21 @@ def detect_session():
     # Default fallback
     return "London", SESSION_WEIGHTS["London"]
 
+@lru_cache(maxsize=32)
+def _session_utc_hours(session_name, local_date):
+    """UTC (start, end) hours of a session on a local date; only changes with DST"""
+    start_local, end_local, _ = SESSIONS_LOCAL[session_name]
+    return _utc_hours(start_local, end_local, _TZ[session_name], local_date)
+
 def get_utc_hours_for_session(start_local, end_local, tz_name, reference_date):
     """Convert local session hours to UTC hours for a given date"""
-    tz = pytz.timezone(tz_name)
-    local_date = reference_date.astimezone(tz).date()
+    tz = ZoneInfo(tz_name)
+    return _utc_hours(start_local, end_local, tz, reference_date.astimezone(tz).date())
 
+def _utc_hours(start_local, end_local, tz, local_date):
     # Create local datetime objects
-    start_local_dt = tz.localize(datetime.combine(local_date, datetime.min.time().replace(hour=start_local)))
-    end_local_dt = tz.localize(datetime.combine(local_date, datetime.min.time().replace(hour=end_local)))
+    start_local_dt = datetime.combine(local_date, datetime.min.time().replace(hour=start_local), tzinfo=tz)
+    end_local_dt = datetime.combine(local_date, datetime.min.time().replace(hour=end_local), tzinfo=tz)
 
     # Handle overnight sessions
     if end_local_dt <= start_local_dt:
@@ -67,7 +87,13 @@ def get_utc_hours_for_session(start_local, end_local, tz_name, reference_date):
 def session_start_timestamp():
     """Get timestamp for current session start (legacy function)"""
     now = datetime.now(dt_timezone.utc)
-    session_name, _ = detect_session()
+    # Depends only on the UTC date and the session, so it is cached per UTC hour like detect_session
+    return _session_start_for_hour(now.replace(minute=0, second=0, microsecond=0))
+
+@lru_cache(maxsize=4)
+def _session_start_for_hour(now):
+    """Session start timestamp (ms) for an hour bucket (now truncated to the UTC hour)"""
+    session_name, _ = _detect_session_for_hour(now)
 
     # For backward compatibility, return a timestamp
     # This is a simplified version - in production you'd want more accurate logic
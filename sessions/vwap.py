@@ -1,6 +1,6 @@
-def calculate_vwap(candles):
-    pv=vol=0
-    for c in candles:
-        tp=(c["high"]+c["low"]+c["close"])/3
-        pv+=tp*c["volume"]; vol+=c["volume"]
-    return round(pv/vol,6) if vol else None
+import numpy as np
+
+def calculate_vwap(high, low, close, volume):
+    vol=volume.sum()
+    if not vol: return None
+    return round(float(np.dot(high+low+close,volume)/(3*vol)),6)
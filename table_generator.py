@@ -1,14 +1,19 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import matplotlib
+# Headless Agg backend, selected once before anything can import pyplot
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.table import Table
-import pandas as pd
+from PIL import Image  # matplotlib already depends on Pillow
 from io import BytesIO
-from datetime import datetime
-import warnings
 import re
 import json
 import os
 import logging
+import atexit
+import time
+import threading
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -17,110 +22,396 @@ formatter = logging.Formatter('[%(filename)s:%(lineno)d] %(levelname)s: %(messag
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+# Pillow renderer (fast path); matplotlib stays as the fallback renderer
+try:
+    from PIL import ImageDraw, ImageFont
+    _FONT_DIR = os.path.join(matplotlib.get_data_path(), 'fonts', 'ttf')
+    _FONTS = {
+        'title': ImageFont.truetype(os.path.join(_FONT_DIR, 'DejaVuSans-Bold.ttf'), 30),
+        'info': ImageFont.truetype(os.path.join(_FONT_DIR, 'DejaVuSans.ttf'), 20),
+        'header': ImageFont.truetype(os.path.join(_FONT_DIR, 'DejaVuSans-Bold.ttf'), 20),
+        'cell': ImageFont.truetype(os.path.join(_FONT_DIR, 'DejaVuSans.ttf'), 17),
+        'cell_bold': ImageFont.truetype(os.path.join(_FONT_DIR, 'DejaVuSans-Bold.ttf'), 17),
+        'footer': ImageFont.truetype(os.path.join(_FONT_DIR, 'DejaVuSans.ttf'), 16),
+    }
+    USE_PILLOW_RENDERER = True
+except (ImportError, OSError) as e:
+    logger.warning(f"Pillow renderer unavailable ({e}), using matplotlib")
+    USE_PILLOW_RENDERER = False
+
+# Fallback renderer reuses one figure/table skeleton instead of building a new one per image.
+# The render worker draws one image at a time; the lock only matters when this module is
+# called directly from several threads of one process
+_TABLE_POOL = None
+_FIGURE_LOCK = threading.Lock()
+
 # Import database functions
 try:
-    from rank_db import save_previous_rankings, load_previous_rankings
+    from rank_db import save_previous_rankings, load_previous_rankings, batch as rankings_batch
     USE_DATABASE = True
     logger.info("✅ Using database for rank tracking")
 except ImportError as e:
     logger.warning(f"Database import failed ({e}), using JSON fallback")
     USE_DATABASE = False
 
-def calculate_rank_changes(current_rankings, previous_rankings, session_name):
-    """
-    Calculate rank changes between current and previous rankings.
-    
-    Args:
-        current_rankings: List of (symbol, rank) tuples for current scan
-        previous_rankings: List of (symbol, rank) tuples for previous scan
-        session_name: Session name for logging
-    
-    Returns:
-        Dict of symbol -> rank_change (positive = moved up, negative = moved down)
-    """
-    if not previous_rankings:
-        return {}
-    
-    # Create dictionaries for easy lookup
-    current_dict = {symbol: rank for symbol, rank in current_rankings}
-    previous_dict = {symbol: rank for symbol, rank in previous_rankings}
-    
-    rank_changes = {}
-    
-    # Calculate changes for symbols that exist in both scans
-    for symbol in current_dict:
-        if symbol in previous_dict:
-            current_rank = current_dict[symbol]
-            previous_rank = previous_dict[symbol]
-            change = previous_rank - current_rank  # Positive = moved up
-            if change != 0:
-                rank_changes[symbol] = change
-    
-    return rank_changes
-
 # File to store previous rankings (fallback)
 RANKINGS_FILE = "previous_rankings.json"
 
+# Fallback rankings live in memory; the file is read once and rewritten every
+# RANKINGS_FLUSH_EVERY saves and at exit. The render worker is terminated at shutdown
+# without running atexit hooks, so render_worker flushes it explicitly before stopping it
+RANKINGS_FLUSH_EVERY = 10
+_rankings_cache = None
+_rankings_dirty = 0
+# Same as _FIGURE_LOCK: uncontended in the render worker, guards direct multi-threaded callers
+_rankings_lock = threading.Lock()
+
+# orjson is optional: same JSON on disk, several times faster to encode
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def flush_rankings_fallback():
+    """Write the in-memory fallback rankings to the JSON file if they changed since the last flush"""
+    global _rankings_dirty
+    with _rankings_lock:
+        if not _rankings_dirty:
+            return
+        try:
+            if orjson is not None:
+                with open(RANKINGS_FILE, 'wb') as f:
+                    f.write(orjson.dumps(_rankings_cache, option=orjson.OPT_INDENT_2))
+            else:
+                with open(RANKINGS_FILE, 'w') as f:
+                    json.dump(_rankings_cache, f, indent=2)
+            _rankings_dirty = 0
+        except Exception as e:
+            logger.warning(f"Could not save rankings data: {e}")
+
+atexit.register(flush_rankings_fallback)
+
 def save_previous_rankings_fallback(rankings_data: dict):
     """
-    Save current rankings to JSON file for comparison in next run (fallback).
+    Store current rankings in memory for comparison in next run (fallback).
 
     Args:
         rankings_data: Dictionary with session_name as key and list of (symbol, rank) tuples as value
     """
-    try:
-        with open(RANKINGS_FILE, 'w') as f:
-            json.dump(rankings_data, f, indent=2)
-    except Exception as e:
-        logger.warning(f"Could not save rankings data: {e}")
+    global _rankings_dirty
+    with _rankings_lock:
+        cache = load_previous_rankings_fallback()
+        if rankings_data is not cache:
+            cache.update(rankings_data)
+        _rankings_dirty += 1
+        pending = _rankings_dirty
+    if pending >= RANKINGS_FLUSH_EVERY:
+        flush_rankings_fallback()
 
 def load_previous_rankings_fallback() -> dict:
     """
-    Load previous rankings from JSON file (fallback).
+    Load previous rankings (fallback), reading the JSON file only on first use.
 
     Returns:
         Dictionary with session_name as key and list of (symbol, rank) tuples as value
     """
-    if not os.path.exists(RANKINGS_FILE):
-        return {}
+    global _rankings_cache
+    if _rankings_cache is not None:
+        return _rankings_cache
 
-    try:
-        with open(RANKINGS_FILE, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.warning(f"Could not load rankings data: {e}")
-        return {}
+    _rankings_cache = {}
+    if os.path.exists(RANKINGS_FILE):
+        try:
+            with open(RANKINGS_FILE, 'r') as f:
+                _rankings_cache = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load rankings data: {e}")
+    return _rankings_cache
 
-def calculate_rank_changes(current_rankings: list, previous_rankings: list, session_name: str) -> dict:
+def calculate_rank_changes(current_rankings: list, previous_map: dict) -> dict:
     """
     Calculate rank changes between current and previous rankings.
 
     Args:
         current_rankings: List of (symbol, rank) tuples for current session
-        previous_rankings: List of (symbol, rank) tuples for previous session
-        session_name: Current session name
+        previous_map: Dictionary mapping symbol to rank from the previous scan
 
     Returns:
         Dictionary mapping symbol to rank change (positive = moved up, negative = moved down)
     """
-    if not previous_rankings:
+    if not previous_map:
         return {}
 
-    # Create symbol to rank mapping for both current and previous
-    current_map = {symbol: rank for symbol, rank in current_rankings}
-    previous_map = {symbol: rank for symbol, rank in previous_rankings}
+    # Rank change = previous_rank - current_rank (positive means moved up), for symbols in both scans
+    return {
+        symbol: previous_map[symbol] - rank
+        for symbol, rank in current_rankings
+        if symbol in previous_map
+    }
+
+# Table layout shared by both renderers - Light theme
+HEADERS = ['Rank', 'Symbol', 'Signal', 'Score', 'Price', 'VWAP', 'Volume', 'RSI', 'MACD', 'Stoch']
+HEADER_COLOR = '#2563eb'  # Blue header
+ALT_ROW_COLORS = ['#f8fafc', '#f1f5f9']  # Alternating row colors (even rows darker)
+TEXT_COLOR = '#1e293b'
+BORDER_COLOR = '#e2e8f0'
+MAX_ROWS = 15  # Limit to top 15 for readability
+
+def style_cells(row: tuple, rank_changes: dict) -> list:
+    """
+    Resolve display text, text color and bold flag for every cell of a row.
+
+    Returns:
+        List of (display_text, text_color, is_bold) tuples, one per column
+    """
+    cells = []
+    for header, value in zip(HEADERS, row):
+        text_color_for_cell = TEXT_COLOR
+        is_bold = False
+        display_text = str(value)
+
+        if header == 'Signal':
+            # Keep default cell color, but color the text
+            if 'STRONG BUY' in display_text:
+                text_color_for_cell = '#0f5132'  # Very dark green for strong buy
+                is_bold = True
+            elif 'BUY' in display_text:
+                text_color_for_cell = '#22c55e'  # Green for buy
+                is_bold = True
+            elif 'STRONG SELL' in display_text:
+                text_color_for_cell = '#b91c1c'  # Very dark red for strong sell
+                is_bold = True
+            elif 'SELL' in display_text:
+                text_color_for_cell = '#ef4444'  # Red for sell
+                is_bold = True
+
+        # Special handling for Rank column to add change indicators
+        elif header == 'Rank':
+            change = rank_changes.get(row[1], 0)  # Symbol is in the second column
+            if change > 0:
+                # Moved up - green text
+                display_text = f"{value} (▲{change})"
+                text_color_for_cell = '#16a34a'  # Dark green text
+            elif change < 0:
+                # Moved down - red text
+                display_text = f"{value} (▼{abs(change)})"
+                text_color_for_cell = '#dc2626'  # Dark red text
+
+        cells.append((display_text, text_color_for_cell, is_bold))
+    return cells
+
+# Pillow table geometry
+PILLOW_WIDTH, PILLOW_MARGIN = 1800, 40
+PILLOW_COL_WIDTH = (PILLOW_WIDTH - 2 * PILLOW_MARGIN) // len(HEADERS)
+PILLOW_HEADER_HEIGHT, PILLOW_ROW_HEIGHT = 48, 40
+PILLOW_TABLE_TOP = 130
+
+@lru_cache(maxsize=32)
+def _pillow_chrome(row_count: int, with_footer: bool):
+    """Background, header row and empty cell grid for row_count rows; drawn once, copied per render"""
+    table_bottom = PILLOW_TABLE_TOP + PILLOW_HEADER_HEIGHT + row_count * PILLOW_ROW_HEIGHT
+    height = table_bottom + (80 if with_footer else 40)
+
+    img = Image.new('RGB', (PILLOW_WIDTH, height), '#ffffff')
+    draw = ImageDraw.Draw(img)
+
+    # Header row
+    for j, header in enumerate(HEADERS):
+        x0 = PILLOW_MARGIN + j * PILLOW_COL_WIDTH
+        draw.rectangle((x0, PILLOW_TABLE_TOP, x0 + PILLOW_COL_WIDTH, PILLOW_TABLE_TOP + PILLOW_HEADER_HEIGHT),
+                       fill=HEADER_COLOR, outline=BORDER_COLOR)
+        draw.text((x0 + PILLOW_COL_WIDTH // 2, PILLOW_TABLE_TOP + PILLOW_HEADER_HEIGHT // 2), header,
+                  font=_FONTS['header'], fill=TEXT_COLOR, anchor='mm')
+
+    # Empty data cells
+    for i in range(1, row_count + 1):
+        row_color = ALT_ROW_COLORS[i % 2]
+        y0 = PILLOW_TABLE_TOP + PILLOW_HEADER_HEIGHT + (i - 1) * PILLOW_ROW_HEIGHT
+        for j in range(len(HEADERS)):
+            x0 = PILLOW_MARGIN + j * PILLOW_COL_WIDTH
+            draw.rectangle((x0, y0, x0 + PILLOW_COL_WIDTH, y0 + PILLOW_ROW_HEIGHT),
+                           fill=row_color, outline=BORDER_COLOR)
+
+    return img
+
+def render_table_pillow(parsed_data: list, rank_changes: dict, title_text: str, session_text: str, footer_text: str = None) -> bytes:
+    """
+    Draw the table with Pillow: cell text over a cached grid, no figure/axes/layout machinery.
+
+    Returns:
+        PNG bytes of the table image
+    """
+    rows = parsed_data[:MAX_ROWS]
+    img = _pillow_chrome(len(rows), bool(footer_text)).copy()
+    draw = ImageDraw.Draw(img)
 
-    rank_changes = {}
+    center_x = PILLOW_WIDTH // 2
+    draw.text((center_x, 50), title_text, font=_FONTS['title'], fill='#1e293b', anchor='mm')
+    draw.text((center_x, 95), session_text, font=_FONTS['info'], fill='#64748b', anchor='mm')
 
-    # Calculate changes for symbols that appear in both rankings
-    for symbol in current_map:
-        if symbol in previous_map:
-            # Rank change = previous_rank - current_rank (positive means moved up)
-            rank_changes[symbol] = previous_map[symbol] - current_map[symbol]
+    # Cell text only; backgrounds and borders come from the chrome
+    for i, row in enumerate(rows, 1):
+        y_mid = PILLOW_TABLE_TOP + PILLOW_HEADER_HEIGHT + (i - 1) * PILLOW_ROW_HEIGHT + PILLOW_ROW_HEIGHT // 2
+        for j, (display_text, text_color_for_cell, is_bold) in enumerate(style_cells(row, rank_changes)):
+            draw.text((PILLOW_MARGIN + j * PILLOW_COL_WIDTH + PILLOW_COL_WIDTH // 2, y_mid), display_text,
+                      font=_FONTS['cell_bold' if is_bold else 'cell'], fill=text_color_for_cell, anchor='mm')
 
-    return rank_changes
+    if footer_text:
+        table_bottom = PILLOW_TABLE_TOP + PILLOW_HEADER_HEIGHT + len(rows) * PILLOW_ROW_HEIGHT
+        draw.text((center_x, table_bottom + 40), footer_text, font=_FONTS['footer'], fill='#94a3b8', anchor='mm')
 
-def generate_table_image(table_data: str, session_name: str = "UNKNOWN", weight: str = "0.0", last_updated: str = None, footer_text: str = None, interval_str: str = None, next_update: str = None) -> BytesIO:
+    # Low compression: encoding speed matters more than a few KB per upload
+    buf = BytesIO()
+    img.save(buf, 'PNG', optimize=False, compress_level=1)
+    return buf.getvalue()
+
+# zlib level 3 encodes these flat-colour tables several times faster than the default 6
+# for a few percent more bytes; optimize=False skips Pillow's extra compression search
+PNG_PIL_KWARGS = {'compress_level': 3, 'optimize': False}
+
+# Fallback figures are 16x10 in: 100 dpi gives 1600x1000 px, plenty for a Discord embed
+# and 2.25x fewer pixels to rasterize and encode than 150 dpi
+FALLBACK_DPI = 100
+
+def canvas_png(fig) -> bytes:
+    """Draw the figure and PNG-encode the Agg canvas pixels without going through savefig/imsave"""
+    fig.canvas.draw()
+    # buffer_rgba() is a memoryview on the Agg buffer; frombuffer wraps it without copying
+    image = Image.frombuffer('RGBA', fig.canvas.get_width_height(), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+    buf = BytesIO()
+    image.save(buf, 'PNG', **PNG_PIL_KWARGS)
+    return buf.getvalue()
+
+class _TablePool:
+    """Figure, text artists and per-row-count tables for the fallback renderer, built once and mutated per render"""
+
+    def __init__(self):
+        # Plain Figure on an Agg canvas: no pyplot figure manager or global current-figure state
+        self.fig = Figure(figsize=(16, 10), dpi=FALLBACK_DPI, facecolor='#ffffff')
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.subplots()
+        self.ax.set_facecolor('#ffffff')
+
+        # Hide axes
+        self.ax.axis('off')
+
+        # Title, session info and configurable footer; only their text changes between renders
+        self.title = self.ax.text(0.5, 0.95, '', transform=self.ax.transAxes,
+                                  fontsize=16, fontweight='bold', color='#1e293b',
+                                  ha='center', va='top')
+        self.session = self.ax.text(0.5, 0.92, '', transform=self.ax.transAxes,
+                                    fontsize=11, color='#64748b',
+                                    ha='center', va='top')
+        self.footer = self.ax.text(0.5, 0.05, '', transform=self.ax.transAxes,
+                                   fontsize=9, color='#94a3b8',
+                                   ha='center', va='bottom')
+
+        # Axes are off and every artist is placed in axes coordinates, so the axes simply
+        # fill the figure; no tight_layout renderer pass needed
+        self.fig.subplots_adjust(left=0, bottom=0, right=1, top=1)
+
+        # The table bbox stretches rows to fill it, so each row count gets its own skeleton
+        self.tables = {}
+        self.current = None
+
+    def table_for(self, row_count: int) -> Table:
+        """Return the table skeleton for row_count rows, swapping it onto the axes"""
+        table = self.tables.get(row_count)
+        if table is None:
+            table = self._build_table(row_count)
+            self.tables[row_count] = table
+
+        if table is not self.current:
+            if self.current is not None:
+                self.current.remove()
+            self.ax.add_table(table)
+            self.current = table
+        return table
+
+    def _build_table(self, row_count: int) -> Table:
+        # Create table
+        table = Table(self.ax, bbox=[0.05, 0.10, 0.9, 0.78])
+
+        # Set table style
+        table.auto_set_font_size(False)
+        table.set_fontsize(10)
+
+        # Add headers
+        for j, header in enumerate(HEADERS):
+            cell = table.add_cell(0, j, width=1/len(HEADERS), height=0.08, text=header,
+                                 loc='center', facecolor=HEADER_COLOR, edgecolor=BORDER_COLOR)
+            cell.get_text().set_color(TEXT_COLOR)
+            cell.get_text().set_fontweight('bold')
+            cell.get_text().set_fontsize(11)
+
+        # Add empty data rows; text, color and weight are filled in per render
+        for i in range(1, row_count + 1):
+            row_color = ALT_ROW_COLORS[i % 2]
+            for j in range(len(HEADERS)):
+                cell = table.add_cell(i, j, width=1/len(HEADERS), height=0.06, text='',
+                                     loc='center', facecolor=row_color, edgecolor=BORDER_COLOR)
+                cell.get_text().set_fontsize(9)
+
+        return table
+
+def render_table_matplotlib(parsed_data: list, rank_changes: dict, title_text: str, session_text: str, footer_text: str = None) -> bytes:
+    """
+    Draw the table on the shared matplotlib figure by updating the pooled cells and text artists.
+
+    Returns:
+        PNG bytes of the table image
+    """
+    global _TABLE_POOL
+    rows = parsed_data[:MAX_ROWS]
+
+    # The shared figure and its pooled artists hold one render's state at a time
+    with _FIGURE_LOCK:
+        if _TABLE_POOL is None:
+            _TABLE_POOL = _TablePool()
+        pool = _TABLE_POOL
+
+        cells = pool.table_for(len(rows)).get_celld()
+        for i, row in enumerate(rows, 1):
+            for j, (display_text, text_color_for_cell, is_bold) in enumerate(style_cells(row, rank_changes)):
+                text = cells[i, j].get_text()
+                text.set_text(display_text)
+                # Most cells keep their style between renders; skip setters that would only re-stale the artist
+                if text.get_color() != text_color_for_cell:
+                    text.set_color(text_color_for_cell)
+                weight = 'bold' if is_bold else 'normal'
+                if text.get_fontweight() != weight:
+                    text.set_fontweight(weight)
+
+        pool.title.set_text(title_text)
+        pool.session.set_text(session_text)
+        pool.footer.set_text(footer_text or '')
+
+        # Encode straight from the canvas: no bbox_inches='tight' measuring pass
+        return canvas_png(pool.fig)
+
+def init_render_worker():
+    """Warm up a dedicated render process: open the rankings database and build the fallback figure"""
+    if USE_DATABASE:
+        load_previous_rankings("", 0)  # Opens the rankings connection; no rows for this key
+    if not USE_PILLOW_RENDERER:
+        global _TABLE_POOL
+        with _FIGURE_LOCK:
+            if _TABLE_POOL is None:
+                _TABLE_POOL = _TablePool()
+
+@lru_cache(maxsize=32)
+def _parse_interval_seconds(interval_str: str) -> int:
+    """Seconds for a display interval such as "30s", "10m" or "1h"; 120 when the unit is not recognised"""
+    interval_lower = interval_str.lower()
+    if interval_lower.endswith('m'):
+        return int(float(interval_lower[:-1])) * 60
+    if interval_lower.endswith('h'):
+        return int(float(interval_lower[:-1]) * 3600)
+    if interval_lower.endswith('s'):
+        return int(float(interval_lower[:-1]))
+    return 120
+
+def generate_table_image(table_data: str, session_name: str = "UNKNOWN", weight: str = "0.0", last_updated: str = None, footer_text: str = None, interval_str: str = None, next_update: str = None) -> bytes:
     """
     Generate a table image from VWAP scanner data.
 
@@ -134,11 +425,8 @@ def generate_table_image(table_data: str, session_name: str = "UNKNOWN", weight:
         next_update: Optional next update time string
 
     Returns:
-        BytesIO object containing the table image
+        PNG bytes of the table image
     """
-    # Set matplotlib backend for headless operation
-    plt.switch_backend('Agg')
-
     # Parse the table data
     parsed_data = parse_table_data(table_data)
 
@@ -150,29 +438,27 @@ def generate_table_image(table_data: str, session_name: str = "UNKNOWN", weight:
     current_rankings = [(row[1], int(row[0])) for row in parsed_data]  # (symbol, rank)
 
     # Parse interval from interval_str (e.g., "10m" -> 600, "1h" -> 3600)
-    interval_seconds = 120  # Default
-    if interval_str:
-        interval_lower = interval_str.lower()
-        if 'm' in interval_lower:
-            interval_seconds = int(float(interval_lower.replace('m', ''))) * 60
-        elif 'h' in interval_lower:
-            interval_seconds = int(float(interval_lower.replace('h', '')) * 3600)
-        elif 's' in interval_lower:
-            interval_seconds = int(float(interval_lower.replace('s', '')))
-    
+    interval_seconds = _parse_interval_seconds(interval_str) if interval_str else 120
+
     logger.info(f"⏱️ Parsed interval: '{interval_str}' → {interval_seconds} seconds")
 
-    # Load previous rankings and calculate changes
+    # Load previous rankings and save current ones for next comparison
     if USE_DATABASE:
-        previous_rankings = load_previous_rankings(session_name, interval_seconds)
+        # One lock hold and one commit for the read and the write
+        with rankings_batch():
+            previous_rankings = load_previous_rankings(session_name, interval_seconds)
+            save_previous_rankings(session_name, current_rankings, interval_seconds)
         logger.info(f"📊 Loaded {len(previous_rankings)} previous rankings for {session_name} [{interval_str}]")
+        logger.info(f"💾 Saved {len(current_rankings)} current rankings for next comparison")
     else:
         # Fallback to JSON (keep session-only for backward compatibility)
         previous_rankings_data = load_previous_rankings_fallback()
         previous_rankings = previous_rankings_data.get(session_name, [])
+        previous_rankings_data[session_name] = current_rankings
+        save_previous_rankings_fallback(previous_rankings_data)
 
-    # Calculate rank changes
-    rank_changes = calculate_rank_changes(current_rankings, previous_rankings, session_name)
+    # Calculate rank changes against a symbol -> rank lookup of the previous scan
+    rank_changes = calculate_rank_changes(current_rankings, dict(previous_rankings))
     
     # Count symbols with changes
     symbols_with_changes = sum(1 for change in rank_changes.values() if change != 0)
@@ -184,138 +470,32 @@ def generate_table_image(table_data: str, session_name: str = "UNKNOWN", weight:
             direction = "↑" if change > 0 else "↓"
             logger.info(f"   {sym}: {direction}{abs(change)}")
 
-    # Save current rankings for next comparison
-    if USE_DATABASE:
-        save_previous_rankings(session_name, current_rankings, interval_seconds)
-        logger.info(f"💾 Saved {len(current_rankings)} current rankings for next comparison")
-    else:
-        # Fallback to JSON
-        previous_rankings_data[session_name] = current_rankings
-        save_previous_rankings_fallback(previous_rankings_data)
-
-    # Create figure with custom styling
-    fig, ax = plt.subplots(figsize=(16, 10), facecolor='#ffffff')
-    ax.set_facecolor('#ffffff')
-
-    # Hide axes
-    ax.axis('off')
-
-    # Create table
-    table = Table(ax, bbox=[0.05, 0.10, 0.9, 0.78])
-
-    # Set table style
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-
-    # Define colors - Light theme
-    header_color = '#2563eb'  # Blue header
-    alt_row_colors = ['#f8fafc', '#f1f5f9']  # Alternating row colors (even rows darker)
-    text_color = '#1e293b'
-    border_color = '#e2e8f0'
-
-    # Column headers
-    headers = ['Rank', 'Symbol', 'Signal', 'Score', 'Price', 'VWAP', 'Volume', 'RSI', 'MACD', 'Stoch']
-
-    # Add headers
-    for j, header in enumerate(headers):
-        cell = table.add_cell(0, j, width=1/len(headers), height=0.08, text=header,
-                             loc='center', facecolor=header_color, edgecolor=border_color)
-        cell.get_text().set_color(text_color)
-        cell.get_text().set_fontweight('bold')
-        cell.get_text().set_fontsize(11)
-
-    # Add data rows
-    for i, row in enumerate(parsed_data[:15], 1):  # Limit to top 15 for readability
-        row_color = alt_row_colors[i % 2]
-
-        for j, (header, value) in enumerate(zip(headers, row)):
-            # Determine cell color based on signal
-            cell_color = row_color
-            text_color_for_cell = text_color  # Initialize default text color
-            is_bold = False  # Initialize bold flag
-            
-            if header == 'Signal':
-                # Keep default cell color, but color the text
-                if 'STRONG BUY' in str(value):
-                    text_color_for_cell = '#0f5132'  # Very dark green for strong buy
-                    is_bold = True
-                elif 'BUY' in str(value):
-                    text_color_for_cell = '#22c55e'  # Green for buy
-                    is_bold = True
-                elif 'STRONG SELL' in str(value):
-                    text_color_for_cell = '#b91c1c'  # Very dark red for strong sell
-                    is_bold = True
-                elif 'SELL' in str(value):
-                    text_color_for_cell = '#ef4444'  # Red for sell
-                    is_bold = True
-
-            # Special handling for Rank column to add change indicators
-            display_text = str(value)
-            if header == 'Rank':
-                text_color_for_cell = text_color  # Default text color for rank column
-                symbol = row[1]  # Symbol is in the second column
-                if symbol in rank_changes:
-                    change = rank_changes[symbol]
-                    if change > 0:
-                        # Moved up - green text
-                        display_text = f"{value} (▲{change})"
-                        text_color_for_cell = '#16a34a'  # Dark green text
-                    elif change < 0:
-                        # Moved down - red text
-                        display_text = f"{value} (▼{abs(change)})"
-                        text_color_for_cell = '#dc2626'  # Dark red text
-
-            cell = table.add_cell(i, j, width=1/len(headers), height=0.06, text=display_text,
-                                 loc='center', facecolor=cell_color, edgecolor=border_color)
-            cell.get_text().set_color(text_color_for_cell)
-            if is_bold:
-                cell.get_text().set_fontweight('bold')
-            cell.get_text().set_fontsize(9)
-
-    # Add table to axes
-    ax.add_table(table)
-
-    # Add title with optional interval/timeframe
+    # Title with optional interval/timeframe
     if interval_str:
         title_text = f"BYBIT FUTURES VWAP SCANNER - UPDATED EVERY {interval_str.upper()}"
     else:
         title_text = f"BYBIT FUTURES VWAP SCANNER"
-    ax.text(0.5, 0.95, title_text, transform=ax.transAxes,
-            fontsize=16, fontweight='bold', color='#1e293b',
-            ha='center', va='top')
 
-    # Add session info and timestamp on same line
+    # Session info and timestamp on same line
     if last_updated and next_update:
         session_text = f"Current Session: {session_name} | Weight: {weight} | Last Updated: {last_updated} | Next Update: {next_update}"
     elif last_updated:
         session_text = f"Current Session: {session_name} | Weight: {weight} | Last Updated: {last_updated}"
     else:
         session_text = f"Current Session: {session_name} | Weight: {weight}"
-    ax.text(0.5, 0.92, session_text, transform=ax.transAxes,
-            fontsize=11, color='#64748b',
-            ha='center', va='top')
-
-    # Add configurable footer text if provided
-    if footer_text:
-        ax.text(0.5, 0.05, footer_text, transform=ax.transAxes,
-                fontsize=9, color='#94a3b8',
-                ha='center', va='bottom')
-
-    # Adjust layout
-    plt.tight_layout()
 
-    # Save to BytesIO
-    buf = BytesIO()
-    fig.savefig(buf, format='png', dpi=150, facecolor='#ffffff',
-                edgecolor='none', bbox_inches='tight')
-    buf.seek(0)
+    if USE_PILLOW_RENDERER:
+        return render_table_pillow(parsed_data, rank_changes, title_text, session_text, footer_text)
 
-    # Close figure to free memory
-    plt.close(fig)
+    return render_table_matplotlib(parsed_data, rank_changes, title_text, session_text, footer_text)
 
-    return buf
+# Signal icons stripped from the text table, and line prefixes that never hold data
+ICON_RE = re.compile(r'[🔴🟢⚪🔥]\s*')
+SKIP_PREFIXES = ('RANK', 'BYBIT', 'Session')
+# First plain decimal after the signal words is the score column
+NUMERIC_RE = re.compile(r'-?\d+(?:\.\d+)?$')
 
-def parse_table_data(table_data: str) -> list:
+def parse_table_data(table_data: str) -> tuple:
     """
     Parse the raw table text data into structured format.
 
@@ -323,18 +503,23 @@ def parse_table_data(table_data: str) -> list:
         table_data: Raw table text
 
     Returns:
-        List of tuples containing parsed row data
+        Tuple of tuples containing parsed row data (cached, so treat as read-only)
     """
     if not isinstance(table_data, str):
-        return []
+        return ()
+
+    return _parse_table_rows(table_data)
 
-    lines = table_data.split('\n')
+@lru_cache(maxsize=8)
+def _parse_table_rows(table_data: str) -> tuple:
+    """Parse table text into row tuples; cached because identical scanner text is often re-rendered"""
+    lines = table_data.splitlines()
     parsed_rows = []
 
     for line in lines:
         line = line.strip()
-        if not line or line.startswith('=') or line.startswith('-') or 'RANK' in line.upper() or 'BYBIT' in line.upper() or 'Session' in line.upper() or 'SYMBOL' in line.upper() or 'SIGNAL' in line.upper():
-            continue
+        # Skip separators and title/header lines; data rows are filtered by numeric rank below
+        if not line or line[0] in '=-' or line.startswith(SKIP_PREFIXES):
             continue
 
         parts = line.split()
@@ -352,18 +537,16 @@ def parse_table_data(table_data: str) -> list:
             # Find symbol (usually second element)
             symbol = parts[1]
 
-            # Find signal (contains text before numeric data)
-            signal_parts = []
-            score_idx = -1
-            for j, part in enumerate(parts[2:], 2):
-                if part.replace('.', '').replace('-', '').isdigit():
-                    score_idx = j
+            # Score follows at most 3 signal tokens (icon + words); scan the rest only for odd lines
+            for score_idx in (2, 3, 4, 5):
+                if NUMERIC_RE.match(parts[score_idx]):
                     break
-                signal_parts.append(part)
+            else:
+                score_idx = next((j for j in range(6, len(parts)) if NUMERIC_RE.match(parts[j])), -1)
 
-            # Clean signal text
-            signal = ' '.join(signal_parts).strip()
-            signal = re.sub(r'[🔴🟢⚪🔥]\s*', '', signal).strip()
+            # Signal is the text between symbol and score; clean it
+            signal = ' '.join(parts[2:score_idx] if score_idx > 0 else parts[2:]).strip()
+            signal = ICON_RE.sub('', signal).strip()
 
             # Extract numeric data
             score = parts[score_idx] if score_idx > 0 else "N/A"
@@ -379,9 +562,9 @@ def parse_table_data(table_data: str) -> list:
         except (IndexError, ValueError):
             continue
 
-    return parsed_rows
+    return tuple(parsed_rows)
 
-def generate_error_image(error_message: str) -> BytesIO:
+def generate_error_image(error_message: str) -> bytes:
     """
     Generate a simple error image when data parsing fails.
 
@@ -389,11 +572,11 @@ def generate_error_image(error_message: str) -> BytesIO:
         error_message: Error message to display
 
     Returns:
-        BytesIO object containing the error image
+        PNG bytes of the error image
     """
-    plt.switch_backend('Agg')
-
-    fig, ax = plt.subplots(figsize=(12, 6), facecolor='#ffffff')
+    fig = Figure(figsize=(12, 6), dpi=FALLBACK_DPI, facecolor='#ffffff')
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
     ax.set_facecolor('#ffffff')
     ax.axis('off')
 
@@ -405,13 +588,8 @@ def generate_error_image(error_message: str) -> BytesIO:
             fontsize=14, color='#64748b', ha='center', va='center')
 
     # Add timestamp
-    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
+    timestamp = time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())
     ax.text(0.5, 0.1, f"Generated: {timestamp}", transform=ax.transAxes,
             fontsize=10, color='#94a3b8', ha='center', va='center')
 
-    buf = BytesIO()
-    fig.savefig(buf, format='png', dpi=150, facecolor='#ffffff', edgecolor='none')
-    buf.seek(0)
-
-    plt.close(fig)
-    return buf
\ No newline at end of file
+    return canvas_png(fig)
\ No newline at end of file
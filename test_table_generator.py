@@ -8,7 +8,10 @@ import os
 import logging
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from table_generator import generate_table_image
+import sqlite3
+import pytest
+import rank_db
+from table_generator import generate_table_image, parse_table_data, calculate_rank_changes, _parse_interval_seconds
 from datetime import datetime
 
 # Set up custom logging with file details
@@ -49,7 +52,7 @@ RANK SYMBOL         SIGNAL          SCORE   PRICE   VWAP    VOLUME  RSI     MACD
     logger.info("Testing rank changes - First run (LONDON session)...")
 
     # Generate first table
-    image_buffer1 = generate_table_image(
+    image_bytes1 = generate_table_image(
         table_data=initial_data,
         session_name="LONDON_TEST",
         weight="1.0",
@@ -58,7 +61,7 @@ RANK SYMBOL         SIGNAL          SCORE   PRICE   VWAP    VOLUME  RSI     MACD
     )
 
     with open("test_rank_change_1.png", 'wb') as f:
-        f.write(image_buffer1.getvalue())
+        f.write(image_bytes1)
 
     # Second run with changed rankings (simulate BTC dropping, ETH moving up)
     changed_data = """
@@ -80,7 +83,7 @@ RANK SYMBOL         SIGNAL          SCORE   PRICE   VWAP    VOLUME  RSI     MACD
     logger.info("Testing rank changes - Second run (LONDON session)...")
 
     # Generate second table with rank changes
-    image_buffer2 = generate_table_image(
+    image_bytes2 = generate_table_image(
         table_data=changed_data,
         session_name="LONDON_TEST",
         weight="1.0",
@@ -89,11 +92,116 @@ RANK SYMBOL         SIGNAL          SCORE   PRICE   VWAP    VOLUME  RSI     MACD
     )
 
     with open("test_rank_change_2.png", 'wb') as f:
-        f.write(image_buffer2.getvalue())
+        f.write(image_bytes2)
 
     logger.info("✅ Rank change test completed!")
     logger.info("📁 Check test_rank_change_1.png and test_rank_change_2.png")
     logger.info("   BTC should show ▼1 (moved down), ETH should show ▲1 (moved up)")
 
+@pytest.mark.parametrize("interval_str, seconds", [
+    ("30s", 30),
+    ("2m", 120),
+    ("10m", 600),
+    ("1h", 3600),
+    ("1.5h", 5400),
+    ("2H", 7200),
+    ("120", 120),  # No recognised unit: default
+])
+def test_parse_interval_seconds(interval_str, seconds):
+    """Interval strings are matched by their unit suffix"""
+    assert _parse_interval_seconds(interval_str) == seconds
+
+def test_parse_table_data_is_cached():
+    """Parsed rows are cached per table text; non-text input parses to nothing"""
+    table_data = "1    BTCUSDT   BUY  95.2  45000  44500  1250000  65.4  0.002  78.5\n"
+
+    rows = parse_table_data(table_data)
+
+    assert isinstance(rows, tuple)
+    assert parse_table_data(table_data) is rows
+    assert parse_table_data(None) == ()
+
+def test_parse_negative_and_decimal_cells():
+    """Signed and decimal numbers are read as numbers, so the score is the first of them"""
+    table_data = (
+        "1    BTCUSDT   STRONG BUY  -12.5  45000.5  44500  1250000  65.4  -0.002  78.5\n"
+        "2    ETHUSDT   NEUTRAL     0      2800     2750   890000   50    0       50\n"
+    )
+
+    assert parse_table_data(table_data) == (
+        ('1', 'BTCUSDT', 'STRONG BUY', '-12.5', '45000.5', '44500', '1250000', '65.4', '-0.002', '78.5'),
+        ('2', 'ETHUSDT', 'NEUTRAL', '0', '2800', '2750', '890000', '50', '0', '50'),
+    )
+
+def test_zero_rank_change():
+    """Symbols in both scans get a change, zero included; new symbols get none"""
+    current = [('ETHUSDT', 1), ('BTCUSDT', 2), ('SOLUSDT', 3)]
+    previous = {'BTCUSDT': 1, 'ETHUSDT': 2, 'SOLUSDT': 3, 'DOTUSDT': 4}
+
+    assert calculate_rank_changes(current, previous) == {'ETHUSDT': 1, 'BTCUSDT': -1, 'SOLUSDT': 0}
+    assert calculate_rank_changes(current + [('ADAUSDT', 4)], previous) == {'ETHUSDT': 1, 'BTCUSDT': -1, 'SOLUSDT': 0}
+    assert calculate_rank_changes(current, {}) == {}
+
+def test_parse_score_position_follows_signal_width():
+    """Score is found after one to three signal tokens, and by the fallback scan beyond that"""
+    table_data = (
+        "1    BTCUSDT   🟢 STRONG BUY  95.2  45000  44500  1250000  65.4  0.002  78.5\n"
+        "2    ETHUSDT   SELL  23.6  2800  2750  890000  41.7  -0.002  31.2\n"
+        "3    XRPUSDT   ⚪ VERY MIXED SIGNAL  7.25  0.5  0.49  1200  44.1  -1  12\n"
+    )
+
+    rows = parse_table_data(table_data)
+
+    assert [(row[2], row[3], row[9]) for row in rows] == [
+        ('STRONG BUY', '95.2', '78.5'),
+        ('SELL', '23.6', '31.2'),
+        ('VERY MIXED SIGNAL', '7.25', '12'),
+    ]
+
+def test_parse_crlf_lines():
+    """Tables pasted with Windows line endings parse like plain newlines"""
+    table_data = (
+        "RANK SYMBOL SIGNAL SCORE PRICE VWAP VOLUME RSI MACD STOCH\r\n"
+        "1    BTCUSDT   BUY   95.2  45000  44500  1250000  65.4  0.002  78.5\r\n"
+        "2    ETHUSDT   SELL  23.6  2800   2750   890000   41.7  -0.002 31.2\r\n"
+    )
+
+    assert parse_table_data(table_data) == parse_table_data(table_data.replace('\r\n', '\n'))
+    assert [row[1] for row in parse_table_data(table_data)] == ['BTCUSDT', 'ETHUSDT']
+
+class CountingConnection(sqlite3.Connection):
+    """sqlite3 connection that counts explicit commits"""
+    commits = 0
+
+    def commit(self):
+        self.commits += 1
+        super().commit()
+
+def test_nested_rankings_batch_commits_once(monkeypatch):
+    """Saves inside nested batch() blocks are committed once, by the outermost block"""
+    conn = sqlite3.connect(':memory:', factory=CountingConnection, check_same_thread=False)
+    rank_db.init_rankings_table(conn)
+    conn.commits = 0
+    monkeypatch.setattr(rank_db, '_connection', conn)
+
+    with rank_db.batch():
+        with rank_db.batch():
+            rank_db.save_previous_rankings('LONDON_TEST', [('BTCUSDT', 1), ('ETHUSDT', 2)], 600)
+        rank_db.save_previous_rankings('TOKYO_TEST', [('BTCUSDT', 1)], 600)
+        assert conn.commits == 0
+        assert conn.in_transaction
+
+    assert conn.commits == 1
+    assert not conn.in_transaction
+    assert conn.execute('SELECT COUNT(*) FROM previous_rankings').fetchone()[0] == 3
+
+    # An error anywhere inside rolls the whole batch back
+    with pytest.raises(RuntimeError):
+        with rank_db.batch():
+            rank_db.save_previous_rankings('NEW_YORK_TEST', [('BTCUSDT', 1)], 600)
+            raise RuntimeError("boom")
+    assert conn.execute('SELECT COUNT(*) FROM previous_rankings').fetchone()[0] == 3
+    conn.close()
+
 if __name__ == "__main__":
     test_rank_changes()
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Shared aiohttp session for outbound HTTP (Bybit REST and Discord webhook)
+"""
+
+import aiohttp
+
+# Upper bound on open connections; kept-alive connections are reused across requests
+MAX_CONNECTIONS = 32
+# Seconds to cache DNS lookups for api.bybit.com / discord.com
+DNS_CACHE_TTL = 300
+# Per-socket limits instead of total=: total also counts time spent queued for one of the
+# MAX_CONNECTIONS slots, which a full scan's burst of kline requests would exceed
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=10)
+
+_session = None
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session, creating it on first use
+
+    Must be called from inside the running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=DNS_CACHE_TTL),
+            timeout=REQUEST_TIMEOUT
+        )
+    return _session
+
+async def close_session():
+    """Close the shared HTTP session if it was opened"""
+    if _session is not None and not _session.closed:
+        await _session.close()
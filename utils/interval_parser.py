@@ -3,6 +3,7 @@ Utility functions for parsing and formatting refresh intervals
 """
 
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -43,6 +44,7 @@ def parse_intervals(interval_str: str) -> list[int]:
         return [120]
 
 
+@lru_cache(maxsize=64)
 def format_interval(seconds: int) -> str:
     """
     Format interval in seconds to human-readable string